@@ -54,6 +54,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # After WhiteNoise, so static files are served without being re-compressed
+    'submission_app.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -62,6 +64,11 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Response compression (see submission_app/middleware.py). gzip never
+# compresses bodies under 200 bytes; Brotli is used when installed.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+
 ROOT_URLCONF = 'A2SVTracker.urls'
 
 TEMPLATES = [
@@ -89,13 +96,22 @@ WSGI_APPLICATION = 'A2SVTracker.wsgi.application'
 # Use dj_database_url for environment-based configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
 
+# Connection pooling (psycopg3 + Django's native pool). Pooled connections
+# replace persistent ones, so CONN_MAX_AGE must be 0 when the pool is on.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_CONN_MAX_AGE = 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '600'))
+
+# Set when connecting through pgbouncer in transaction pooling mode, where a
+# server connection is not pinned to a client between transactions.
+DB_PGBOUNCER_TRANSACTION_MODE = os.getenv('DB_PGBOUNCER_TRANSACTION_MODE', 'False') == 'True'
+
 if DATABASE_URL:
     # Production: Use DATABASE_URL from Render/environment
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
-            conn_health_checks=True,
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=not DB_POOL,
         )
     }
 else:
@@ -108,9 +124,45 @@ else:
             'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
             'HOST': os.getenv('DB_HOST', 'localhost'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': not DB_POOL,
         }
     }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    _db_options = DATABASES['default'].setdefault('OPTIONS', {})
+
+    if DB_POOL:
+        # Django validates pooled connections with ConnectionPool.check_connection.
+        _db_options['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            # Seconds a request waits for a free connection before failing
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            # Seconds before idle connections above min_size are closed
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),
+        }
+
+    if DB_PGBOUNCER_TRANSACTION_MODE:
+        # Named cursors and prepared statements live on one server connection,
+        # which transaction-mode pgbouncer does not guarantee.
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        _db_options['prepare_threshold'] = None
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # SQLite has no row locks, so select_for_update() is a no-op. Taking the
+    # write lock when a transaction begins makes concurrent writers wait on
+    # the busy timeout instead of failing with "database is locked" when a
+    # read lock cannot be upgraded mid-transaction.
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    })
+    # The default in-memory test database uses shared-cache table locks, which
+    # ignore the busy timeout; a file behaves like the real database under threads.
+    DATABASES['default'].setdefault('TEST', {}).setdefault('NAME', str(BASE_DIR / 'test_db.sqlite3'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -159,6 +211,20 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Prime caches and templates when the WSGI app is loaded; /healthz/ returns
+# 503 until that has finished (see submission_app/warmup.py and start.sh)
+WARMUP_ON_BOOT = os.getenv('WARMUP_ON_BOOT', 'False') == 'True'
+
+# Email (invitation resends from the Django admin). The console default only prints
+# messages, so with DEBUG off the resend action refuses to run until this is set.
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'A2SV Tracker <noreply@a2sv.org>')
+
+# Cold storage for archived cohorts (gzip JSON Lines, see archive_cohort). There is
+# no default: archive_cohort deletes the rows it archives, so this must point at
+# storage that survives a deploy (a mounted disk, not the app directory on Render).
+ARCHIVE_ROOT = Path(os.environ['ARCHIVE_ROOT']) if os.getenv('ARCHIVE_ROOT') else None
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
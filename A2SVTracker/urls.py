@@ -7,6 +7,7 @@ from submission_app import views
 
 urlpatterns = [
     path('django-admin/', admin.site.urls),
+    path('healthz/', views.health_check, name='health_check'),
     
     # Authentication
     path('', views.login_view, name='home'),
@@ -27,4 +28,7 @@ urlpatterns = [
     path('admin-dashboard/questions/<int:question_id>/delete/', views.question_delete, name='question_delete'),
     path('admin-dashboard/applicants/', views.applicant_tracker, name='applicant_tracker'),
     path('admin-dashboard/applicants/export/', views.export_applicants, name='export_applicants'),
+    path('admin-dashboard/applicants/collisions/', views.link_collisions, name='link_collisions'),
+    path('admin-dashboard/applicants/reviews/export/', views.export_reviews, name='export_reviews'),
+    path('admin-dashboard/applicants/<int:user_id>/review/', views.application_review, name='application_review'),
 ]
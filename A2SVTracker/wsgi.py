@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'A2SVTracker.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_BOOT:
+    # Under gunicorn --preload this runs once in the master, before workers fork
+    from submission_app.warmup import warm_up  # noqa: E402
+
+    warm_up()
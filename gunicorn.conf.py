@@ -0,0 +1,19 @@
+"""
+Gunicorn settings used by start.sh.
+
+start.sh runs gunicorn with --preload, so Django is imported and warmed
+up once in the master process and workers are forked from that state.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+
+
+def post_fork(server, worker):
+    # Connections were closed before forking; open this worker's own now
+    # instead of on its first request.
+    from django.db import connections
+
+    for alias in connections:
+        connections[alias].ensure_connection()
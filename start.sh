@@ -1,12 +1,17 @@
 #!/bin/bash
-# Startup script for Render - runs migrations and starts gunicorn
+# Startup script for Render - applies pending migrations and starts gunicorn
 
 set -e
 
-echo "Running database migrations..."
-python manage.py migrate --noinput 2>/dev/null || {
-    echo "  Migrations skipped (database may not be ready yet)"
-}
+# `migrate --check` exits non-zero when migrations are unapplied; only then run them.
+# Any real failure (e.g. database unreachable) surfaces from the migrate call.
+if python manage.py migrate --check >/dev/null 2>&1; then
+    echo "No pending migrations"
+else
+    echo "Applying pending migrations..."
+    python manage.py migrate --noinput
+fi
 
 echo "Starting Gunicorn..."
-exec gunicorn A2SVTracker.wsgi:application --bind 0.0.0.0:$PORT
+export WARMUP_ON_BOOT="${WARMUP_ON_BOOT:-True}"
+exec gunicorn A2SVTracker.wsgi:application --config gunicorn.conf.py --preload
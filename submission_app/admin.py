@@ -1,3 +1,216 @@
-from django.contrib import admin
+import json
+from datetime import timedelta
 
-# Register your models here.
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.mail import send_mass_mail
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .catalog import invalidate_catalog
+from .models import ApplicationSnapshot, Cohort, User, Question, Submission, InvitationToken
+
+
+# settings.EMAIL_BACKEND default, which only prints messages to the server log
+CONSOLE_EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids COUNT(*) over large tables.
+
+    On PostgreSQL the row count comes from the planner: pg_class.reltuples
+    for an unfiltered changelist, and the row estimate of EXPLAIN for a
+    filtered one. Only results estimated below ``exact_count_threshold``,
+    and other databases, get an exact count.
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_rows(self.object_list)
+        if estimate is not None and estimate >= self.exact_count_threshold:
+            return estimate
+        return super().count
+
+    @staticmethod
+    def _estimated_rows(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        if queryset.query.where:
+            plan = json.loads(queryset.order_by().values('pk').explain(format='json'))
+            # A list when the driver hands back the plan as text, its only element otherwise.
+            if isinstance(plan, list):
+                plan = plan[0]
+            return int(plan['Plan']['Plan Rows'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for a table that has never been vacuumed or analyzed.
+        if row is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+
+def submission_count_subquery(field):
+    """
+    Correlated COUNT of submissions per row. Unlike a JOIN + GROUP BY it is only
+    evaluated for the rows on the current changelist page.
+    """
+    counts = Submission.objects.filter(
+        **{field: OuterRef('pk')}
+    ).order_by().values(field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist defaults for tables that grow with every application cycle."""
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) Django runs to show "x of y selected".
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(Cohort)
+class CohortAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_active', 'mandatory_required', 'total_questions', 'created_at', 'closed_at', 'archived_at')
+    list_filter = ('is_active',)
+    readonly_fields = ('closed_at', 'archived_at')
+
+    def save_model(self, request, obj, form, change):
+        if 'is_active' in form.changed_data:
+            # Deactivating closes the cohort; reopening it clears the mark.
+            obj.closed_at = None if obj.is_active else timezone.now()
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin, LargeTableAdmin):
+    list_display = ('username', 'email', 'first_name', 'role', 'cohort', 'is_finalized', 'submission_count')
+    list_select_related = ('cohort',)
+    # Matches the (cohort, role, is_finalized) index.
+    list_filter = ('cohort', 'role', 'is_finalized')
+    raw_id_fields = ('cohort',)
+    fieldsets = BaseUserAdmin.fieldsets + (
+        ('Application', {'fields': ('role', 'cohort', 'is_finalized')}),
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(submission_count=submission_count_subquery('user'))
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and form.changed_data:
+            # Part of the applicant tracker and dashboard ETags, which would otherwise go stale.
+            User.objects.filter(pk=obj.pk).update(progress_version=F('progress_version') + 1)
+        if 'is_finalized' in form.changed_data and not obj.is_finalized:
+            # Reopened for edits: the frozen copy no longer describes the application.
+            ApplicationSnapshot.objects.filter(user=obj).delete()
+
+    @admin.display(description='Submissions', ordering='submission_count')
+    def submission_count(self, obj):
+        return obj.submission_count
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = ('title', 'cohort', 'q_type', 'difficulty', 'is_active', 'submission_count')
+    list_select_related = ('cohort',)
+    # Matches the (cohort, is_active, q_type) index.
+    list_filter = ('cohort', 'is_active', 'q_type', 'difficulty')
+    search_fields = ('title',)
+    raw_id_fields = ('cohort',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(submission_count=submission_count_subquery('question'))
+
+    @admin.display(description='Submissions', ordering='submission_count')
+    def submission_count(self, obj):
+        return obj.submission_count
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_catalog(obj.cohort)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_catalog(obj.cohort)
+
+
+@admin.register(Submission)
+class SubmissionAdmin(LargeTableAdmin):
+    list_display = ('user', 'question', 'cohort', 'verification_status', 'submitted_at')
+    list_select_related = ('user', 'question', 'cohort')
+    # Cohort is the leading column of the submission indexes; status has its own.
+    list_filter = ('cohort', 'verification_status')
+    raw_id_fields = ('user', 'question', 'cohort')
+    readonly_fields = ('link_hash', 'submitted_at', 'verified_at')
+
+
+@admin.register(InvitationToken)
+class InvitationTokenAdmin(LargeTableAdmin):
+    list_display = ('token', 'email', 'cohort', 'used', 'expiry_date')
+    list_select_related = ('cohort',)
+    list_filter = ('cohort', 'used')
+    search_fields = ('=token', '=email')
+    raw_id_fields = ('cohort',)
+    actions = ('resend_invitations', 'expire_invitations')
+
+    @admin.action(description='Resend selected invitations (extends expiry by 7 days)')
+    def resend_invitations(self, request, queryset):
+        if settings.EMAIL_BACKEND == CONSOLE_EMAIL_BACKEND and not settings.DEBUG:
+            self.message_user(
+                request,
+                'Email is not configured: EMAIL_BACKEND is the console backend, so nothing would be delivered. '
+                'Set EMAIL_BACKEND and its SMTP settings before resending invitations.',
+                messages.ERROR,
+            )
+            return
+
+        unused = queryset.filter(used=False)
+        # Extending a closed cohort's tokens would undo sweep_invitations.
+        closed = unused.filter(cohort__closed_at__isnull=False).count()
+        pending = list(unused.filter(cohort__closed_at__isnull=True))
+        if not pending:
+            self.message_user(
+                request,
+                f'No unused invitations of open cohorts selected ({closed} of closed cohorts skipped).'
+                if closed else 'No unused invitations selected.',
+                messages.WARNING,
+            )
+            return
+
+        expiry_date = timezone.now() + timedelta(days=7)
+        register_url = request.build_absolute_uri(reverse('register'))
+        emails = [
+            (
+                'Your A2SV application invitation',
+                f'Use code {invitation.token} to register: {register_url}?token={invitation.token}\n'
+                f'This invitation expires on {expiry_date:%Y-%m-%d %H:%M} UTC.',
+                settings.DEFAULT_FROM_EMAIL,
+                [invitation.email],
+            )
+            for invitation in pending
+        ]
+        # One SMTP connection for the whole batch.
+        sent = send_mass_mail(emails)
+        queryset.filter(pk__in=[invitation.pk for invitation in pending]).update(expiry_date=expiry_date)
+        if closed:
+            self.message_user(request, f'Resent {sent} invitation(s); skipped {closed} of closed cohorts.', messages.SUCCESS)
+        else:
+            self.message_user(request, f'Resent {sent} invitation(s).', messages.SUCCESS)
+
+    @admin.action(description='Expire selected invitations')
+    def expire_invitations(self, request, queryset):
+        expired = queryset.filter(used=False, expiry_date__gt=timezone.now()).update(expiry_date=timezone.now())
+        self.message_user(request, f'Expired {expired} invitation(s).', messages.SUCCESS)
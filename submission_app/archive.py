@@ -0,0 +1,122 @@
+"""
+Cold storage for closed cohorts.
+
+A cohort archive is a gzip-compressed JSON Lines file. Every line is one
+record of the form ``{"model": <label in ARCHIVED_MODELS>, "fields": {...}}``
+where ``fields`` holds the concrete column values of the row. Records are
+streamed into the file once and never rewritten.
+
+Archives hold applicants' emails and password hashes, so they are created
+readable by their owner only.
+"""
+import datetime
+import gzip
+import json
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.dateparse import parse_datetime
+
+from .models import ApplicationSnapshot, User, Submission, InvitationToken
+
+
+ARCHIVED_MODELS = {
+    'user': User,
+    'submission': Submission,
+    'snapshot': ApplicationSnapshot,
+    'invitation': InvitationToken,
+}
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps full microsecond precision on timestamps."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def archive_root():
+    """Return ARCHIVE_ROOT, which must be set explicitly (see settings.py)."""
+    if settings.ARCHIVE_ROOT is None:
+        raise ImproperlyConfigured(
+            'ARCHIVE_ROOT is not set. Point it at durable storage before archiving.'
+        )
+    return settings.ARCHIVE_ROOT
+
+
+def archive_path(cohort):
+    """Return the archive file location for a cohort."""
+    return archive_root() / f'cohort-{cohort.pk}.jsonl.gz'
+
+
+def create_archive(path):
+    """Open a new archive file at ``path`` for writing, with 0600 permissions."""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
+    # O_CREAT leaves the mode of a file left over from an earlier run alone.
+    os.chmod(path, 0o600)
+    return gzip.open(path, 'wt', encoding='utf-8')
+
+
+def field_names(model):
+    """Column names (``user_id`` rather than ``user``) stored for a model."""
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def write_records(archive, label, rows):
+    """Append ``rows`` (dicts from ``values()``) to an open archive file."""
+    count = 0
+    for row in rows:
+        line = json.dumps({'model': label, 'fields': row}, cls=ArchiveEncoder)
+        archive.write(line + '\n')
+        count += 1
+    return count
+
+
+def iter_records(path):
+    """Yield ``(label, fields)`` for every record in an archive file."""
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        for line in archive:
+            if line.strip():
+                record = json.loads(line)
+                yield record['model'], record['fields']
+
+
+def build_instance(label, fields):
+    """Rebuild an unsaved model instance from archived column values."""
+    model = ARCHIVED_MODELS[label]
+    values = dict(fields)
+    for field in model._meta.concrete_fields:
+        if isinstance(field, models.DateTimeField) and values.get(field.attname):
+            values[field.attname] = parse_datetime(values[field.attname])
+    return model(**values)
+
+
+def applicant_rows(path):
+    """
+    Yield ``(name, email, total_submissions, is_finalized)`` per archived
+    applicant, ranked like the live CSV export.
+    """
+    applicants = {}
+    totals = Counter()
+    for label, fields in iter_records(path):
+        if label == 'user' and fields['role'] == User.Roles.APPLICANT:
+            applicants[fields['id']] = fields
+        elif label == 'submission':
+            totals[fields['user_id']] += 1
+
+    ranked = sorted(applicants.values(), key=lambda fields: -totals[fields['id']])
+    for fields in ranked:
+        full_name = f"{fields['first_name']} {fields['last_name']}".strip()
+        yield (
+            full_name or fields['username'],
+            fields['email'],
+            totals[fields['id']],
+            fields['is_finalized'],
+        )
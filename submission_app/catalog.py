@@ -0,0 +1,66 @@
+"""
+Cached per-cohort question catalog and dashboard statistics.
+
+Applicant dashboards read the active questions of their cohort on every
+page load, while the catalog itself only changes when an admin edits
+questions. The cache key includes ``Cohort.questions_version``, which is
+read from the database with the cohort on every request. Writers call
+``invalidate_catalog`` once after their change to bump that stamp, so every
+process moves on to a fresh key even though the default cache is
+per-process. The same stamp is used in page ETags. The admin statistics are
+simply cached for a short time.
+"""
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Cohort, Question, Submission, User
+
+
+CATALOG_TIMEOUT = 60 * 60
+STATS_TIMEOUT = 60
+
+
+def catalog_key(cohort):
+    if cohort is None:
+        return 'question-catalog:none'
+    return f'question-catalog:{cohort.pk}:{cohort.questions_version}'
+
+
+def get_catalog(cohort):
+    """Return ``{'mandatory': [...], 'recommended': [...]}`` active questions for a cohort."""
+    key = catalog_key(cohort)
+    catalog = cache.get(key)
+    if catalog is None:
+        questions = Question.objects.filter(cohort=cohort, is_active=True).order_by('difficulty')
+        catalog = {'mandatory': [], 'recommended': []}
+        for question in questions:
+            if question.q_type == Question.QuestionType.MANDATORY:
+                catalog['mandatory'].append(question)
+            else:
+                catalog['recommended'].append(question)
+        cache.set(key, catalog, CATALOG_TIMEOUT)
+    return catalog
+
+
+def invalidate_catalog(cohort):
+    """Bump the cohort's questions_version stamp, which retires every cached copy of its catalog."""
+    cache.delete(catalog_key(cohort))
+    if cohort is not None:
+        Cohort.objects.filter(pk=cohort.pk).update(questions_version=F('questions_version') + 1)
+        cohort.refresh_from_db(fields=['questions_version'])
+
+
+def get_cohort_stats(cohort):
+    """Return the admin dashboard counters for a cohort, cached for STATS_TIMEOUT seconds."""
+    key = f'cohort-stats:{cohort.pk if cohort else "none"}'
+    stats = cache.get(key)
+    if stats is None:
+        applicants = User.objects.filter(cohort=cohort, role=User.Roles.APPLICANT)
+        stats = {
+            'total_applicants': applicants.count(),
+            'finalized_applicants': applicants.filter(is_finalized=True).count(),
+            'total_questions': Question.objects.filter(cohort=cohort, is_active=True).count(),
+            'total_submissions': Submission.objects.filter(cohort=cohort).count(),
+        }
+        cache.set(key, stats, STATS_TIMEOUT)
+    return stats
@@ -1,5 +1,6 @@
 from django import forms
 from django.core.exceptions import ValidationError
+from .links import normalize_link
 from .models import Question, Submission
 
 
@@ -86,6 +87,15 @@ class SubmissionForm(forms.ModelForm):
                 'placeholder': 'https://leetcode.com/submissions/...'
             })
         }
+    
+    def clean_submission_link(self):
+        link = self.cleaned_data.get('submission_link')
+        if link:
+            try:
+                link = normalize_link(link)
+            except ValueError:
+                raise ValidationError('Enter a valid URL.')
+        return link
 
 
 class QuestionForm(forms.ModelForm):
@@ -0,0 +1,48 @@
+"""
+Normalization of solution links so that cosmetic differences (scheme,
+letter case, ``www.``, trailing slashes, tracking parameters) do not hide
+two applicants sharing the same submission.
+"""
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Query parameters that never change which submission a link points at.
+NOISE_PARAMS = {'envtype', 'envid', 'ref', 'source', 'fbclid', 'gclid'}
+
+
+def normalize_link(url):
+    """
+    Return a canonical form of ``url`` for comparison and storage.
+    Raises ValueError for a malformed URL, such as one with an invalid port.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[len('www.'):]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in NOISE_PARAMS and not key.lower().startswith('utm_')
+    )
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def comparable_link(url):
+    """
+    ``normalize_link`` for links that are already stored. Rows saved before
+    links were validated may not parse; they are compared as stored.
+    """
+    try:
+        return normalize_link(url)
+    except ValueError:
+        return url.strip()
+
+
+def link_hash(url):
+    """SHA-256 hex digest of the normalized link, used as an index key."""
+    return hashlib.sha256(comparable_link(url).encode('utf-8')).hexdigest()
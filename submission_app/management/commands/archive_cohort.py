@@ -0,0 +1,99 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from submission_app import archive
+from submission_app.models import ApplicationSnapshot, Cohort, User, Submission
+
+
+class Command(BaseCommand):
+    help = 'Move the applicants and submissions of a closed cohort into a compressed archive file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'cohort',
+            type=str,
+            help='Name of the closed cohort to archive'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched and deleted per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        cohort = Cohort.objects.filter(name=options['cohort']).first()
+        if cohort is None:
+            raise CommandError(f'Cohort "{options["cohort"]}" does not exist.')
+        if cohort.is_active:
+            raise CommandError('The active cohort cannot be archived. Activate another cohort first.')
+
+        try:
+            path = archive.archive_path(cohort)
+        except ImproperlyConfigured as exc:
+            raise CommandError(exc)
+
+        chunk_size = options['chunk_size']
+        applicants = User.objects.filter(cohort=cohort, role=User.Roles.APPLICANT)
+        submissions = Submission.objects.filter(cohort=cohort)
+        snapshots = ApplicationSnapshot.objects.filter(cohort=cohort)
+
+        if cohort.archived_at is None:
+            if path.exists():
+                raise CommandError(f'Archive file {path} already exists.')
+            # Phase 0: close the cohort to writes. submit_question and finalize hold
+            # the applicant row lock while they check archived_at, so taking every
+            # applicant lock here waits out any write that is already in flight.
+            with transaction.atomic():
+                list(applicants.select_for_update().values_list('pk', flat=True))
+                cohort.archived_at = timezone.now()
+                cohort.closed_at = cohort.closed_at or cohort.archived_at
+                cohort.save(update_fields=['archived_at', 'closed_at'])
+        elif path.exists() and not (applicants.exists() or submissions.exists() or snapshots.exists()):
+            raise CommandError(f'Cohort "{cohort}" was already archived on {cohort.archived_at:%Y-%m-%d}.')
+        else:
+            self.stdout.write(f'  Resuming the interrupted archive of cohort {cohort}')
+
+        if not path.exists():
+            partial_path = path.with_name(path.name + '.partial')
+
+            # Phase 1: stream every row to the archive before touching the hot tables.
+            # Writing to a .partial file first means a crashed run never leaves a
+            # truncated archive under the final name.
+            with archive.create_archive(partial_path) as archive_file:
+                user_count = archive.write_records(
+                    archive_file, 'user',
+                    applicants.order_by('pk').values(*archive.field_names(User)).iterator(chunk_size=chunk_size),
+                )
+                submission_count = archive.write_records(
+                    archive_file, 'submission',
+                    submissions.order_by('pk').values(*archive.field_names(Submission)).iterator(chunk_size=chunk_size),
+                )
+                archive.write_records(
+                    archive_file, 'snapshot',
+                    snapshots.order_by('pk').values(*archive.field_names(ApplicationSnapshot)).iterator(chunk_size=chunk_size),
+                )
+            partial_path.rename(path)
+            self.stdout.write(f'  Wrote {user_count} applicants and {submission_count} submissions to {path}')
+
+        # Phase 2: delete in bounded batches so no single statement holds locks for long.
+        deleted_submissions = self.delete_in_batches(submissions, chunk_size)
+        self.delete_in_batches(snapshots, chunk_size)
+        deleted_users = self.delete_in_batches(applicants, chunk_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Archived cohort {cohort}: removed {deleted_users} applicants and '
+            f'{deleted_submissions} submissions from the database'
+        ))
+
+    def delete_in_batches(self, queryset, chunk_size):
+        """Delete the rows of ``queryset`` a chunk of primary keys at a time."""
+        model = queryset.model
+        deleted = 0
+        while True:
+            batch = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not batch:
+                return deleted
+            model.objects.filter(pk__in=batch).delete()
+            deleted += len(batch)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from submission_app.links import link_hash
+from submission_app.models import Submission
+
+
+class Command(BaseCommand):
+    help = 'Compute link_hash for submissions saved before link hashing existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Submissions hashed per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pending = Submission.objects.filter(link_hash='').order_by('pk')
+        last_pk = 0
+        updated = 0
+
+        while True:
+            # Keyset pagination keeps each batch an index range scan on the pk.
+            batch = list(pending.filter(pk__gt=last_pk).only('pk', 'submission_link')[:batch_size])
+            if not batch:
+                break
+            for submission in batch:
+                submission.link_hash = link_hash(submission.submission_link)
+            Submission.objects.bulk_update(batch, ['link_hash'])
+            updated += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f'  Hashed {updated} submissions...')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Backfilled link hashes for {updated} submissions'))
@@ -0,0 +1,105 @@
+import csv
+import json
+import multiprocessing
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from submission_app.models import Cohort, cohort_thresholds
+from submission_app.reporting import APPLICANT_COLUMNS, CohortReport, aggregate_range, applicant_ranges
+
+
+class Command(BaseCommand):
+    help = 'Compute end-of-cycle statistics for a cohort and write them as JSON and CSV files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cohort',
+            type=str,
+            help='Name of the cohort to report on (default: the active cohort)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            help='Directory for summary.json, applicants.csv and questions.csv (default: reports/cohort-<id>)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processes to split applicants across by id range (default: 1)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched from the database per round trip (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['cohort']:
+            cohort = Cohort.objects.filter(name=options['cohort']).first()
+            if cohort is None:
+                raise CommandError(f'Cohort "{options["cohort"]}" does not exist.')
+            if cohort.archived_at:
+                raise CommandError(
+                    f'Cohort "{cohort}" is archived. Restore it with restore_cohort before reporting on it.'
+                )
+        else:
+            cohort = Cohort.get_active()
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+
+        cohort_pk = cohort.pk if cohort else None
+        output_dir = Path(options['output_dir'] or f'reports/cohort-{cohort_pk or "none"}')
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        ranges = applicant_ranges(cohort, options['workers'])
+        part_paths = [output_dir / f'applicants.csv.part{index}' for index in range(len(ranges))]
+        tasks = [
+            (cohort_pk, low, high, path, options['chunk_size'])
+            for (low, high), path in zip(ranges, part_paths)
+        ]
+
+        report = CohortReport(cohort_thresholds(cohort)[0])
+        try:
+            if len(tasks) > 1:
+                # Spawned workers set Django up from scratch and open their own
+                # database connections instead of inheriting the parent's.
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(len(tasks), mp_context=context, initializer=django.setup) as executor:
+                    for partial in executor.map(aggregate_range, *zip(*tasks)):
+                        report.merge(partial)
+            else:
+                for task in tasks:
+                    report.merge(aggregate_range(*task))
+
+            # Stitch the per-range rows together in id order.
+            with open(output_dir / 'applicants.csv', 'w', encoding='utf-8', newline='') as output:
+                csv.writer(output).writerow(APPLICANT_COLUMNS)
+                for path in part_paths:
+                    with open(path, encoding='utf-8', newline='') as part:
+                        shutil.copyfileobj(part, output)
+        finally:
+            for path in part_paths:
+                path.unlink(missing_ok=True)
+
+        with open(output_dir / 'questions.csv', 'w', encoding='utf-8', newline='') as output:
+            report.write_questions(cohort, output)
+
+        summary = report.summary(cohort)
+        summary['generated_at'] = timezone.now().isoformat()
+        with open(output_dir / 'summary.json', 'w', encoding='utf-8') as output:
+            json.dump(summary, output, indent=2)
+            output.write('\n')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Reported on {report.applicants} applicants and {report.submissions} submissions '
+            f'of cohort {cohort or "(none)"} in {output_dir}'
+        ))
+        self.stdout.write(
+            f'  Finalized: {report.finalized}, reached the mandatory threshold: {report.reached_mandatory}'
+        )
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from submission_app.models import (
+    Cohort,
+    DEFAULT_MANDATORY_REQUIRED,
+    DEFAULT_TOTAL_QUESTIONS,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create a cohort (application cycle) and optionally make it the active one'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'name',
+            type=str,
+            help='Unique name of the cohort, e.g. "2026 Cycle"'
+        )
+        parser.add_argument(
+            '--mandatory',
+            type=int,
+            default=DEFAULT_MANDATORY_REQUIRED,
+            help=f'Mandatory questions required to finalize (default: {DEFAULT_MANDATORY_REQUIRED})'
+        )
+        parser.add_argument(
+            '--total',
+            type=int,
+            default=DEFAULT_TOTAL_QUESTIONS,
+            help=f'Total number of questions in the cycle (default: {DEFAULT_TOTAL_QUESTIONS})'
+        )
+        parser.add_argument(
+            '--activate',
+            action='store_true',
+            help='Make this the active cohort, closing the current one'
+        )
+
+    def handle(self, *args, **options):
+        name = options['name']
+        if Cohort.objects.filter(name=name).exists():
+            raise CommandError(f'Cohort "{name}" already exists.')
+
+        with transaction.atomic():
+            if options['activate']:
+                Cohort.objects.filter(is_active=True).update(is_active=False, closed_at=timezone.now())
+            cohort = Cohort.objects.create(
+                name=name,
+                mandatory_required=options['mandatory'],
+                total_questions=options['total'],
+                is_active=options['activate'],
+            )
+
+        status = 'active' if cohort.is_active else 'inactive'
+        self.stdout.write(self.style.SUCCESS(f'✓ Created {status} cohort: {cohort.name}'))
+        self.stdout.write(f'  Mandatory required: {cohort.mandatory_required}')
+        self.stdout.write(f'  Total questions: {cohort.total_questions}')
@@ -1,9 +1,9 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from datetime import timedelta
 import secrets
 import string
-from submission_app.models import InvitationToken
+from submission_app.models import Cohort, InvitationToken, User
 
 
 class Command(BaseCommand):
@@ -22,6 +22,11 @@ class Command(BaseCommand):
             default=7,
             help='Number of days until expiry (default: 7)'
         )
+        parser.add_argument(
+            '--cohort',
+            type=str,
+            help='Name of the cohort to invite into (default: the active cohort)'
+        )
 
     def generate_6digit_code(self):
         """Generate a 6-character alphanumeric code."""
@@ -32,11 +37,28 @@ class Command(BaseCommand):
         days = options['days']
         expiry_date = timezone.now() + timedelta(days=days)
         
-        self.stdout.write(self.style.SUCCESS(f'\n  Creating invitation tokens (expires in {days} days)...\n'))
+        if options['cohort']:
+            cohort = Cohort.objects.filter(name=options['cohort']).first()
+            if cohort is None:
+                raise CommandError(f'Cohort "{options["cohort"]}" does not exist.')
+        else:
+            cohort = Cohort.get_active()
+            if cohort is None:
+                raise CommandError('No active cohort. Create one with create_cohort --activate.')
+        
+        self.stdout.write(self.style.SUCCESS(f'\n  Creating invitation tokens for {cohort} (expires in {days} days)...\n'))
         
         for email in emails:
-            # Check if email already has an unused token
-            existing = InvitationToken.objects.filter(email=email, used=False).first()
+            # Usernames are emails and unique across cohorts
+            if User.objects.filter(username=email).exists():
+                self.stdout.write(self.style.WARNING(f'  Email {email} already has an account; skipping'))
+                self.stdout.write('')
+                continue
+            
+            # Check if email already has a live token
+            existing = InvitationToken.objects.filter(
+                cohort=cohort, email=email, used=False, expiry_date__gt=timezone.now()
+            ).first()
             if existing:
                 self.stdout.write(self.style.WARNING(f'  Email {email} already has an unused token: {existing.token}'))
                 self.stdout.write(f'  Registration URL: http://localhost:8000/register/?token={existing.token}')
@@ -52,6 +74,7 @@ class Command(BaseCommand):
             invitation = InvitationToken.objects.create(
                 token=token,
                 email=email,
+                cohort=cohort,
                 expiry_date=expiry_date
             )
             
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from submission_app.forms import QuestionForm
+from submission_app.models import Cohort, Question
+
+
+QUESTION_FIELDS = QuestionForm.Meta.fields
+
+
+class Command(BaseCommand):
+    help = 'Export the questions of a cohort as CSV or JSON, in the format import_questions reads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            default='csv',
+            help='Output format (default: csv)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='File to write to (default: standard output)'
+        )
+        parser.add_argument(
+            '--cohort',
+            type=str,
+            help='Name of the cohort to export (default: the active cohort)'
+        )
+        parser.add_argument(
+            '--include-inactive',
+            action='store_true',
+            help='Also export deactivated questions'
+        )
+
+    def handle(self, *args, **options):
+        if options['cohort']:
+            cohort = Cohort.objects.filter(name=options['cohort']).first()
+            if cohort is None:
+                raise CommandError(f'Cohort "{options["cohort"]}" does not exist.')
+        else:
+            cohort = Cohort.get_active()
+
+        questions = Question.objects.filter(cohort=cohort)
+        if not options['include_inactive']:
+            questions = questions.filter(is_active=True)
+        rows = questions.order_by('q_type', 'difficulty', 'pk').values(*QUESTION_FIELDS)
+
+        # A cohort has tens of questions; render them whole, then write once.
+        output = io.StringIO(newline='')
+        if options['format'] == 'csv':
+            writer = csv.DictWriter(output, fieldnames=QUESTION_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(list(rows), output, indent=2)
+            output.write('\n')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as destination:
+                destination.write(output.getvalue())
+        else:
+            self.stdout.write(output.getvalue(), ending='')
@@ -0,0 +1,150 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from submission_app.catalog import invalidate_catalog
+from submission_app.forms import QuestionForm
+from submission_app.links import comparable_link, normalize_link
+from submission_app.models import Cohort, Question
+
+
+QUESTION_FIELDS = QuestionForm.Meta.fields
+
+
+class Command(BaseCommand):
+    help = 'Import questions from a CSV or JSON file, matching existing ones by LeetCode link'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='CSV or JSON file with title, leetcode_link, q_type, difficulty[, is_active]'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='File format (default: taken from the file extension)'
+        )
+        parser.add_argument(
+            '--cohort',
+            type=str,
+            help='Name of the cohort to import into (default: the active cohort)'
+        )
+        parser.add_argument(
+            '--deactivate-missing',
+            action='store_true',
+            help='Deactivate active questions of the cohort that are not in the file'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the changes without saving them'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'File {path} not found.')
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format not in ('csv', 'json'):
+            raise CommandError('Cannot tell the file format; pass --format csv or --format json.')
+
+        if options['cohort']:
+            cohort = Cohort.objects.filter(name=options['cohort']).first()
+            if cohort is None:
+                raise CommandError(f'Cohort "{options["cohort"]}" does not exist.')
+        else:
+            cohort = Cohort.get_active()
+            if cohort is None:
+                raise CommandError('No active cohort. Create one with create_cohort --activate.')
+
+        incoming = self.read_questions(path, file_format)
+        existing = {}
+        for question in Question.objects.filter(cohort=cohort).order_by('pk'):
+            existing.setdefault(comparable_link(question.leetcode_link), question)
+
+        to_create, to_update, to_deactivate = [], [], []
+        changed_fields = set()
+        for link, values in incoming.items():
+            question = existing.get(link)
+            if question is None:
+                to_create.append(Question(cohort=cohort, **values))
+                self.stdout.write(self.style.SUCCESS(f'  + {values["title"]}'))
+                continue
+            # Links already match once normalized, so cosmetic differences are not updates.
+            changes = {
+                field: (getattr(question, field), value)
+                for field, value in values.items()
+                if field != 'leetcode_link' and getattr(question, field) != value
+            }
+            if changes:
+                for field, (_, value) in changes.items():
+                    setattr(question, field, value)
+                to_update.append(question)
+                changed_fields.update(changes)
+                summary = ', '.join(f'{field}: {old!r} → {new!r}' for field, (old, new) in changes.items())
+                self.stdout.write(self.style.WARNING(f'  ~ {question.title} ({summary})'))
+
+        if options['deactivate_missing']:
+            for link, question in existing.items():
+                if link not in incoming and question.is_active:
+                    question.is_active = False
+                    to_deactivate.append(question)
+                    self.stdout.write(self.style.ERROR(f'  - {question.title}'))
+
+        summary = (
+            f'{len(to_create)} to add, {len(to_update)} to update, '
+            f'{len(to_deactivate)} to deactivate'
+        )
+        if options['dry_run']:
+            self.stdout.write(f'\n  Dry run: {summary}. Nothing was saved.')
+            return
+
+        with transaction.atomic():
+            Question.objects.bulk_create(to_create)
+            if to_update:
+                Question.objects.bulk_update(to_update, sorted(changed_fields))
+            if to_deactivate:
+                Question.objects.bulk_update(to_deactivate, ['is_active'])
+            # One invalidation for the whole import, once it is committed.
+            transaction.on_commit(lambda: invalidate_catalog(cohort))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Imported questions into {cohort}: {len(to_create)} added, '
+            f'{len(to_update)} updated, {len(to_deactivate)} deactivated'
+        ))
+
+    def read_questions(self, path, file_format):
+        """Validate every row with QuestionForm and key them by normalized link."""
+        with path.open(encoding='utf-8', newline='') as source:
+            if file_format == 'csv':
+                rows = list(csv.DictReader(source))
+            else:
+                rows = json.load(source)
+                if not isinstance(rows, list):
+                    raise CommandError('A JSON import must be a list of question objects.')
+
+        questions = {}
+        for number, row in enumerate(rows, start=1):
+            data = {field: row.get(field) for field in QUESTION_FIELDS}
+            if data['is_active'] in (None, ''):
+                data['is_active'] = True
+            form = QuestionForm(data=data)
+            if not form.is_valid():
+                errors = '; '.join(
+                    f'{field}: {", ".join(messages)}' for field, messages in form.errors.items()
+                )
+                raise CommandError(f'Row {number} is invalid ({errors}).')
+            values = {field: form.cleaned_data[field] for field in QUESTION_FIELDS}
+            try:
+                link = normalize_link(values['leetcode_link'])
+            except ValueError as exc:
+                raise CommandError(f'Row {number} is invalid (leetcode_link: {exc}).')
+            if link in questions:
+                self.stdout.write(self.style.WARNING(
+                    f'  Row {number} repeats {values["leetcode_link"]}; keeping the later row.'
+                ))
+            questions[link] = values
+        return questions
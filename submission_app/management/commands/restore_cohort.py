@@ -0,0 +1,130 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from submission_app import archive
+from submission_app.models import Cohort, Submission, User
+
+
+# Conflicting rows listed in the error before it is cut short
+MAX_REPORTED_CONFLICTS = 20
+
+
+class Command(BaseCommand):
+    help = 'Load an archived cohort back into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'cohort',
+            type=str,
+            help='Name of the archived cohort to restore'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows inserted per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        cohort = Cohort.objects.filter(name=options['cohort']).first()
+        if cohort is None:
+            raise CommandError(f'Cohort "{options["cohort"]}" does not exist.')
+        if not cohort.archived_at:
+            raise CommandError(f'Cohort "{cohort}" is not archived.')
+
+        try:
+            path = archive.archive_path(cohort)
+        except ImproperlyConfigured as exc:
+            raise CommandError(exc)
+        if not path.exists():
+            # archive_cohort only deletes rows after the archive file is in place,
+            # so an interrupted run left everything in the database.
+            cohort.archived_at = None
+            cohort.save(update_fields=['archived_at'])
+            self.stdout.write(self.style.WARNING(
+                f'Archive file {path} not found; archiving never finished. Reopened cohort {cohort}.'
+            ))
+            return
+
+        chunk_size = options['chunk_size']
+        restored = {label: 0 for label in archive.ARCHIVED_MODELS}
+        batches = {label: [] for label in archive.ARCHIVED_MODELS}
+
+        with transaction.atomic():
+            conflicts = self.find_conflicts(path, chunk_size)
+            if conflicts:
+                listed = '\n'.join(f'  {conflict}' for conflict in conflicts[:MAX_REPORTED_CONFLICTS])
+                more = len(conflicts) - MAX_REPORTED_CONFLICTS
+                if more > 0:
+                    listed += f'\n  ... and {more} more'
+                raise CommandError(
+                    f'Cannot restore cohort {cohort}: {len(conflicts)} archived rows clash with rows '
+                    f'created since it was archived. Resolve them and run restore_cohort again.\n{listed}'
+                )
+
+            for label, fields in archive.iter_records(path):
+                if label != 'user' and batches['user']:
+                    # Applicants precede their submissions in the file; insert them first.
+                    restored['user'] += self.flush('user', batches['user'])
+                batch = batches[label]
+                batch.append(archive.build_instance(label, fields))
+                if len(batch) >= chunk_size:
+                    restored[label] += self.flush(label, batch)
+            for label, batch in batches.items():
+                restored[label] += self.flush(label, batch)
+
+            cohort.archived_at = None
+            cohort.save(update_fields=['archived_at'])
+
+        # Keep the file for the record, but out of the way of a future archive run.
+        path.rename(path.with_name(f'cohort-{cohort.pk}.restored-{timezone.now():%Y%m%d%H%M%S}.jsonl.gz'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Restored cohort {cohort}: {restored["user"]} applicants and '
+            f'{restored["submission"]} submissions'
+        ))
+
+    def find_conflicts(self, path, chunk_size):
+        """
+        Describe every archived row whose primary key is taken again, and every
+        archived applicant whose username has since been registered, e.g. by
+        the same person signing up for a later cohort.
+        """
+        pks = {label: [] for label in archive.ARCHIVED_MODELS}
+        usernames = []
+        for label, fields in archive.iter_records(path):
+            pks[label].append(fields['id'])
+            if label == 'user':
+                usernames.append(fields['username'])
+
+        conflicts = []
+        for label, ids in pks.items():
+            model = archive.ARCHIVED_MODELS[label]
+            for start in range(0, len(ids), chunk_size):
+                taken = model.objects.filter(pk__in=ids[start:start + chunk_size]).values_list('pk', flat=True)
+                conflicts.extend(f'{label} id {pk} already exists' for pk in taken)
+        for start in range(0, len(usernames), chunk_size):
+            taken = User.objects.filter(
+                username__in=usernames[start:start + chunk_size]
+            ).values_list('username', 'pk')
+            conflicts.extend(f'username {username} is taken by user id {pk}' for username, pk in taken)
+        return conflicts
+
+    def flush(self, label, batch):
+        """Insert a batch of rebuilt instances and empty it."""
+        if not batch:
+            return 0
+        model = archive.ARCHIVED_MODELS[label]
+        if model is Submission:
+            # auto_now_add overwrites submitted_at on insert; put the original back.
+            submitted_at = [submission.submitted_at for submission in batch]
+            model.objects.bulk_create(batch)
+            for submission, original in zip(batch, submitted_at):
+                submission.submitted_at = original
+            model.objects.bulk_update(batch, ['submitted_at'])
+        else:
+            model.objects.bulk_create(batch)
+        count = len(batch)
+        batch.clear()
+        return count
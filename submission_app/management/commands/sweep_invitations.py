@@ -0,0 +1,129 @@
+import string
+import time
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from submission_app import archive
+from submission_app.models import InvitationToken
+
+
+# Tokens are 6 characters drawn from A-Z and 0-9 (see create_invite).
+TOKEN_ALPHABET = string.ascii_uppercase + string.digits
+TOKEN_LENGTH = 6
+TOKEN_SPACE = len(TOKEN_ALPHABET) ** TOKEN_LENGTH
+
+
+class Command(BaseCommand):
+    help = 'Expire invitations of closed cohorts and remove stale tokens in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-days',
+            type=int,
+            default=30,
+            help='Keep tokens for this many days after they expire (default: 30)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tokens updated or deleted per statement (default: 1000)'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches to spread out the load (default: 0)'
+        )
+        parser.add_argument(
+            '--archive',
+            action='store_true',
+            help='Write removed tokens to a gzip JSON Lines file under ARCHIVE_ROOT first'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be expired and removed'
+        )
+
+    def handle(self, *args, **options):
+        if options['archive']:
+            try:
+                archive.archive_root()
+            except ImproperlyConfigured as exc:
+                raise CommandError(exc)
+
+        now = timezone.now()
+        batch_size = options['batch_size']
+
+        # Phase 1: live tokens of cohorts that are no longer accepting applicants.
+        closed = InvitationToken.objects.filter(
+            used=False, expiry_date__gt=now, cohort__closed_at__isnull=False
+        )
+        # Phase 2: tokens (used or not) that expired longer ago than the grace period.
+        stale = InvitationToken.objects.filter(
+            expiry_date__lt=now - timedelta(days=options['grace_days'])
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'  Would expire {closed.count()} tokens of closed cohorts')
+            self.stdout.write(f'  Would remove {stale.count()} stale tokens')
+        else:
+            expired = self.in_batches(
+                closed, batch_size, options['pause'],
+                lambda pks: InvitationToken.objects.filter(pk__in=pks).update(expiry_date=now),
+            )
+            self.stdout.write(f'  Expired {expired} tokens of closed cohorts')
+
+            if options['archive']:
+                removed = self.archive_and_delete(stale, batch_size, options['pause'])
+            else:
+                removed = self.in_batches(
+                    stale, batch_size, options['pause'],
+                    lambda pks: InvitationToken.objects.filter(pk__in=pks).delete(),
+                )
+            self.stdout.write(f'  Removed {removed} stale tokens')
+
+        in_use = InvitationToken.objects.count()
+        live = InvitationToken.objects.filter(used=False, expiry_date__gt=timezone.now()).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {live} live tokens; {TOKEN_SPACE - in_use:,} of {TOKEN_SPACE:,} '
+            f'codes still available ({in_use / TOKEN_SPACE:.6%} used)'
+        ))
+
+    def in_batches(self, queryset, batch_size, pause, apply):
+        """
+        Apply ``apply(pks)`` to ``queryset`` one bounded batch at a time. Each
+        batch is its own short autocommit statement, so row locks are brief.
+        """
+        done = 0
+        while True:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return done
+            apply(pks)
+            done += len(pks)
+            if pause:
+                time.sleep(pause)
+
+    def archive_and_delete(self, queryset, batch_size, pause):
+        """Stream stale tokens into an archive file, deleting each batch once written."""
+        path = archive.archive_root() / f'invitations-{timezone.now():%Y%m%d%H%M%S}.jsonl.gz'
+        fields = archive.field_names(InvitationToken)
+
+        with archive.create_archive(path) as archive_file:
+            def write_and_delete(pks):
+                rows = InvitationToken.objects.filter(pk__in=pks).order_by('pk').values(*fields)
+                archive.write_records(archive_file, 'invitation', rows)
+                archive_file.flush()
+                InvitationToken.objects.filter(pk__in=pks).delete()
+
+            removed = self.in_batches(queryset, batch_size, pause, write_and_delete)
+
+        if removed:
+            self.stdout.write(f'  Archived removed tokens to {path}')
+        else:
+            path.unlink()
+        return removed
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from submission_app.models import Submission
+from submission_app.verification import ConnectionPool, verify_link
+
+
+class Command(BaseCommand):
+    help = 'Check that unverified submission links resolve and point at the right problem'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Submissions loaded and saved per batch (default: 200)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Links checked at the same time (default: 16)'
+        )
+        parser.add_argument(
+            '--per-host',
+            type=int,
+            default=4,
+            help='Concurrent requests allowed to a single host (default: 4)'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10,
+            help='Connect/read timeout in seconds (default: 10)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Stop after checking this many submissions'
+        )
+        parser.add_argument(
+            '--retry-unreachable',
+            action='store_true',
+            help='Also re-check submissions previously marked unreachable'
+        )
+
+    def handle(self, *args, **options):
+        statuses = [Submission.VerificationStatus.PENDING]
+        if options['retry_unreachable']:
+            statuses.append(Submission.VerificationStatus.UNREACHABLE)
+
+        pending = Submission.objects.filter(
+            verification_status__in=statuses
+        ).select_related('question').only(
+            'pk', 'submission_link', 'link_hash', 'question__leetcode_link'
+        ).order_by('pk')
+
+        batch_size = options['batch_size']
+        limit = options['limit']
+        pool = ConnectionPool(per_host=options['per_host'], timeout=options['timeout'])
+        totals = {}
+        checked = 0
+        last_pk = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                while limit is None or checked < limit:
+                    size = batch_size if limit is None else min(batch_size, limit - checked)
+                    batch = list(pending.filter(pk__gt=last_pk)[:size])
+                    if not batch:
+                        break
+
+                    # Only the HTTP checks run in worker threads; the ORM stays on this one.
+                    results = list(executor.map(
+                        lambda submission: verify_link(
+                            pool, submission.submission_link, submission.question.leetcode_link
+                        ),
+                        batch,
+                    ))
+                    checked_at = timezone.now()
+                    with transaction.atomic():
+                        for submission, status in zip(batch, results):
+                            # Skip rows whose link was changed while it was being checked;
+                            # the resubmission reset them to pending for the next run.
+                            written = Submission.objects.filter(
+                                pk=submission.pk,
+                                link_hash=submission.link_hash,
+                                verification_status__in=statuses,
+                            ).update(verification_status=status, verified_at=checked_at)
+                            if written:
+                                totals[status] = totals.get(status, 0) + 1
+
+                    checked += len(batch)
+                    last_pk = batch[-1].pk
+                    self.stdout.write(f'  Checked {checked} submissions...')
+        finally:
+            pool.close()
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Verified {checked} submissions'))
+        for status, count in sorted(totals.items()):
+            self.stdout.write(f'  {Submission.VerificationStatus(status).label}: {count}')
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+from submission_app.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Prime the question catalog, stats and template caches and check the database connection'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        compiled = warm_up()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Warmed up {compiled} templates, catalog and stats in {elapsed:.2f}s'
+        ))
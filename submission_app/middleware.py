@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip.
+    brotli = None
+
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+)
+
+# gzip hides random padding in its header against BREACH; Brotli has no such
+# field, so pages that carry a CSRF token are always sent as gzip.
+BROTLI_EXCLUDED_TYPES = ('text/html',)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress text responses with Brotli when the client and server support it,
+    otherwise gzip. HTML always uses gzip for its BREACH padding. Responses smaller than COMPRESSION_MIN_SIZE bytes are sent
+    as is, and streaming responses (the CSV exports) are compressed chunk by
+    chunk without being buffered.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if (
+            brotli is not None
+            and not getattr(response, 'is_async', False)
+            and not response['Content-Type'].startswith(BROTLI_EXCLUDED_TYPES)
+            and re_accepts_brotli.search(ae)
+        ):
+            return self.brotli_response(response)
+        return super().process_response(request, response)
+
+    def brotli_response(self, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.streaming:
+            response.streaming_content = self.brotli_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = brotli.compress(
+                response.content, quality=settings.BROTLI_QUALITY
+            )
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # Compression changes the bytes, so a strong ETag must become weak.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+    @staticmethod
+    def brotli_sequence(sequence):
+        compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+        for chunk in sequence:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('submission_app', '0002_invitationtoken_submission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cohort',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('is_active', models.BooleanField(default=False)),
+                ('mandatory_required', models.PositiveIntegerField(default=15)),
+                ('total_questions', models.PositiveIntegerField(default=40)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='unique_active_cohort')],
+            },
+        ),
+        migrations.AddField(
+            model_name='invitationtoken',
+            name='cohort',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='invitations', to='submission_app.cohort'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='cohort',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='questions', to='submission_app.cohort'),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='cohort',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='submissions', to='submission_app.cohort'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='cohort',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='applicants', to='submission_app.cohort'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['cohort', 'is_active', 'q_type'], name='question_cohort_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['cohort', 'user'], name='submission_cohort_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['cohort', 'role', 'is_finalized'], name='user_cohort_role_idx'),
+        ),
+    ]
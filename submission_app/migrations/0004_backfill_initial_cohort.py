@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def assign_initial_cohort(apps, schema_editor):
+    """Move rows created before cohorts existed into a single active cohort."""
+    Cohort = apps.get_model('submission_app', 'Cohort')
+    User = apps.get_model('submission_app', 'User')
+    Question = apps.get_model('submission_app', 'Question')
+    Submission = apps.get_model('submission_app', 'Submission')
+    InvitationToken = apps.get_model('submission_app', 'InvitationToken')
+
+    if not (Question.objects.exists() or User.objects.filter(role='APPLICANT').exists()):
+        return
+
+    cohort = Cohort.objects.create(name='Initial cohort', is_active=True)
+    Question.objects.filter(cohort__isnull=True).update(cohort=cohort)
+    Submission.objects.filter(cohort__isnull=True).update(cohort=cohort)
+    InvitationToken.objects.filter(cohort__isnull=True).update(cohort=cohort)
+    User.objects.filter(role='APPLICANT', cohort__isnull=True).update(cohort=cohort)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0003_cohort'),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_initial_cohort, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0004_backfill_initial_cohort'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cohort',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0005_cohort_archived_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='link_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['cohort', 'link_hash'], name='submission_cohort_link_idx'),
+        ),
+    ]
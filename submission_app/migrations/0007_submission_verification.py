@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0006_submission_link_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='verification_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('VERIFIED', 'Verified'), ('REACHABLE', 'Reachable, problem unconfirmed'), ('MISMATCH', 'Wrong problem'), ('UNREACHABLE', 'Unreachable')], default='PENDING', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['verification_status', 'id'], name='submission_verify_idx'),
+        ),
+    ]
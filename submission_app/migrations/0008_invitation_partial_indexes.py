@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0007_submission_verification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitationtoken',
+            index=models.Index(condition=models.Q(('used', False)), fields=['email', 'expiry_date'], name='invite_unused_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitationtoken',
+            index=models.Index(condition=models.Q(('used', False)), fields=['expiry_date'], name='invite_unused_expiry_idx'),
+        ),
+    ]
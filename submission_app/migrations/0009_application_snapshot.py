@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0008_invitation_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('finalized_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('mandatory_count', models.PositiveIntegerField()),
+                ('total_count', models.PositiveIntegerField()),
+                ('submissions', models.JSONField(default=list)),
+                ('cohort', models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='snapshots', to='submission_app.cohort')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['cohort', 'finalized_at'], name='snapshot_cohort_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0009_application_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cohort',
+            name='questions_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='progress_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_closed_cohorts(apps, schema_editor):
+    """Inactive cohorts created before the active one, or archived, have already closed."""
+    Cohort = apps.get_model('submission_app', 'Cohort')
+    now = timezone.now()
+    Cohort.objects.filter(archived_at__isnull=False).update(closed_at=now)
+    active = Cohort.objects.filter(is_active=True).first()
+    if active is not None:
+        Cohort.objects.filter(
+            is_active=False, closed_at__isnull=True, created_at__lt=active.created_at
+        ).update(closed_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0010_version_stamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cohort',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_closed_cohorts, migrations.RunPython.noop),
+    ]
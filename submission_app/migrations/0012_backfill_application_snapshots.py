@@ -0,0 +1,51 @@
+from django.db import migrations
+
+
+def snapshot_finalized_applicants(apps, schema_editor):
+    """
+    Freeze applicants who finalized before snapshots existed, from their current
+    submissions. Their real finalize time was never recorded, so their last
+    submission time (or registration time) stands in for it.
+    """
+    User = apps.get_model('submission_app', 'User')
+    Submission = apps.get_model('submission_app', 'Submission')
+    ApplicationSnapshot = apps.get_model('submission_app', 'ApplicationSnapshot')
+
+    pending = User.objects.filter(is_finalized=True, snapshot__isnull=True).order_by('pk')
+    for user in pending.iterator(chunk_size=500):
+        rows = list(
+            Submission.objects.filter(
+                cohort_id=user.cohort_id, user=user
+            ).select_related('question').order_by('question__q_type', 'question__difficulty')
+        )
+        submissions = [
+            {
+                'question_id': sub.question.pk,
+                'title': sub.question.title,
+                'q_type': sub.question.q_type,
+                'difficulty': sub.question.difficulty,
+                'submission_link': sub.submission_link,
+                'submitted_at': sub.submitted_at.isoformat(),
+            }
+            for sub in rows
+        ]
+        last_submitted_at = max((sub.submitted_at for sub in rows), default=None)
+        ApplicationSnapshot.objects.create(
+            user=user,
+            cohort_id=user.cohort_id,
+            finalized_at=last_submitted_at or user.date_joined,
+            mandatory_count=sum(1 for sub in submissions if sub['q_type'] == 'MANDATORY'),
+            total_count=len(submissions),
+            submissions=submissions,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0011_cohort_closed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(snapshot_finalized_applicants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0012_backfill_application_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='idempotency_key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission_app', '0013_submission_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='submission',
+            name='verification_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('VERIFIED', 'Verified'), ('REACHABLE', 'Reachable, problem unconfirmed'), ('MISMATCH', 'Wrong problem'), ('UNREACHABLE', 'Unreachable'), ('UNSUPPORTED', 'Not checked, not a LeetCode link')], default='PENDING', max_length=20),
+        ),
+    ]
@@ -1,6 +1,53 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.utils import timezone
+
+
+DEFAULT_MANDATORY_REQUIRED = 15
+DEFAULT_TOTAL_QUESTIONS = 40
+
+
+class Cohort(models.Model):
+    """An application cycle that owns its questions, invitations and applicants."""
+    name = models.CharField(max_length=100, unique=True)
+    is_active = models.BooleanField(default=False)  # pyright: ignore[reportArgumentType]
+    mandatory_required = models.PositiveIntegerField(default=DEFAULT_MANDATORY_REQUIRED)  # pyright: ignore[reportArgumentType]
+    total_questions = models.PositiveIntegerField(default=DEFAULT_TOTAL_QUESTIONS)  # pyright: ignore[reportArgumentType]
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped whenever the cohort's questions change; part of page ETags.
+    questions_version = models.PositiveIntegerField(default=0)  # pyright: ignore[reportArgumentType]
+    # Set when the cohort stops being the active one. An inactive cohort without it
+    # has not opened yet and can already take invitations.
+    closed_at = models.DateTimeField(null=True, blank=True)
+    # Set when archive_cohort starts; from then on the cohort takes no more writes.
+    # Its rows are in cold storage once the archive file exists.
+    archived_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # At most one cohort may be the current cycle at a time.
+            models.UniqueConstraint(
+                fields=["is_active"],
+                condition=models.Q(is_active=True),
+                name="unique_active_cohort",
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def get_active(cls):
+        """Return the current cohort, or None if no cycle is open."""
+        return cls.objects.filter(is_active=True).first()
+
+
+def cohort_thresholds(cohort):
+    """Return (mandatory_required, total_questions) for a cohort, falling back to defaults."""
+    if cohort is None:
+        return DEFAULT_MANDATORY_REQUIRED, DEFAULT_TOTAL_QUESTIONS
+    return cohort.mandatory_required, cohort.total_questions
 
 
 class User(AbstractUser):
@@ -14,6 +61,20 @@ class User(AbstractUser):
         default=Roles.APPLICANT,
     )
     is_finalized = models.BooleanField(default=False) # pyright: ignore[reportArgumentType]
+    # Bumped on every submission change, on finalize and on admin edits; part of page ETags.
+    progress_version = models.PositiveIntegerField(default=0)  # pyright: ignore[reportArgumentType]
+    cohort = models.ForeignKey(
+        Cohort,
+        on_delete=models.PROTECT,
+        related_name="applicants",
+        null=True,
+        blank=True,
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["cohort", "role", "is_finalized"], name="user_cohort_role_idx"),
+        ]
 
 
 class Question(models.Model):
@@ -26,6 +87,12 @@ class Question(models.Model):
         MEDIUM = "MEDIUM", "Medium"
         HARD = "HARD", "Hard"
 
+    cohort = models.ForeignKey(
+        Cohort,
+        on_delete=models.PROTECT,
+        related_name="questions",
+        null=True,
+    )
     title = models.CharField(max_length=255)
     leetcode_link = models.URLField()
     q_type = models.CharField(
@@ -39,8 +106,29 @@ class Question(models.Model):
     # Default True is valid at runtime; this inline directive silences a strict type-checker complaint.
     is_active = models.BooleanField(default=True)  # pyright: ignore[reportArgumentType]
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["cohort", "is_active", "q_type"], name="question_cohort_active_idx"),
+        ]
+
 
 class Submission(models.Model):
+    class VerificationStatus(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        VERIFIED = "VERIFIED", "Verified"
+        REACHABLE = "REACHABLE", "Reachable, problem unconfirmed"
+        MISMATCH = "MISMATCH", "Wrong problem"
+        UNREACHABLE = "UNREACHABLE", "Unreachable"
+        # Refused without being requested: not an https:// LeetCode link
+        UNSUPPORTED = "UNSUPPORTED", "Not checked, not a LeetCode link"
+
+    # Denormalized from question.cohort so cohort-wide aggregates skip the join.
+    cohort = models.ForeignKey(
+        Cohort,
+        on_delete=models.PROTECT,
+        related_name="submissions",
+        null=True,
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -52,14 +140,78 @@ class Submission(models.Model):
         related_name="submissions",
     )
     submission_link = models.URLField()
+    # SHA-256 of the normalized submission_link (see links.py), for duplicate detection.
+    link_hash = models.CharField(max_length=64, blank=True, default="")
+    # SHA-256 of the client's idempotency key for the last write, if it sent one.
+    idempotency_key = models.CharField(max_length=64, blank=True, default="")
     submitted_at = models.DateTimeField(auto_now_add=True)
+    # Filled in offline by the verify_submissions command, never during a request.
+    verification_status = models.CharField(
+        max_length=20,
+        choices=VerificationStatus.choices,
+        default=VerificationStatus.PENDING,
+    )
+    verified_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ("user", "question")
+        indexes = [
+            models.Index(fields=["cohort", "user"], name="submission_cohort_user_idx"),
+            models.Index(fields=["cohort", "link_hash"], name="submission_cohort_link_idx"),
+            models.Index(fields=["verification_status", "id"], name="submission_verify_idx"),
+        ]
+
+
+class ApplicationSnapshot(models.Model):
+    """Frozen copy of an applicant's submissions, taken when they finalize."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="snapshot",
+    )
+    cohort = models.ForeignKey(
+        Cohort,
+        on_delete=models.PROTECT,
+        related_name="snapshots",
+        null=True,
+    )
+    finalized_at = models.DateTimeField(default=timezone.now)
+    mandatory_count = models.PositiveIntegerField()
+    total_count = models.PositiveIntegerField()
+    # [{"question_id", "title", "q_type", "difficulty", "submission_link", "submitted_at"}, ...]
+    submissions = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["cohort", "finalized_at"], name="snapshot_cohort_idx"),
+        ]
 
 
 class InvitationToken(models.Model):
+    cohort = models.ForeignKey(
+        Cohort,
+        on_delete=models.PROTECT,
+        related_name="invitations",
+        null=True,
+    )
     token = models.CharField(max_length=255, unique=True)
     email = models.EmailField()
     used = models.BooleanField(default=False) # pyright: ignore[reportArgumentType]
     expiry_date = models.DateTimeField()
+
+    class Meta:
+        # Partial indexes only cover the small set of live (unused) tokens.
+        # Expiry cannot be part of the predicate because now() is not immutable,
+        # so it is indexed as a column instead.
+        indexes = [
+            models.Index(
+                fields=["email", "expiry_date"],
+                condition=models.Q(used=False),
+                name="invite_unused_email_idx",
+            ),
+            models.Index(
+                fields=["expiry_date"],
+                condition=models.Q(used=False),
+                name="invite_unused_expiry_idx",
+            ),
+        ]
@@ -0,0 +1,296 @@
+"""
+End-of-cycle statistics for a cohort, computed offline.
+
+``aggregate_range`` makes one ordered pass over the cohort's submissions
+(joined with their question) for a range of applicant ids, alongside an
+equally ordered pass over the applicants themselves. Per-applicant rows are
+written to CSV as soon as an applicant's submissions have been read, so only
+one applicant is held in memory at a time. Everything else is kept in a
+``CohortReport`` whose size depends on the number of questions and hours in
+the cycle, not on the number of submissions, and reports for separate id
+ranges can be merged. This lets the cohort_report command split the work
+across processes.
+"""
+import csv
+import math
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+from .models import Cohort, Question, Submission, User, cohort_thresholds
+
+
+APPLICANT_COLUMNS = [
+    'id', 'username', 'name', 'email', 'date_joined',
+    'submissions', 'mandatory', 'easy', 'medium', 'hard',
+    'first_submitted_at', 'last_submitted_at',
+    'reached_mandatory_at', 'hours_to_mandatory',
+    'is_finalized', 'finalized_at', 'hours_to_finalize',
+]
+
+QUESTION_COLUMNS = [
+    'id', 'title', 'q_type', 'difficulty', 'is_active',
+    'submissions', 'solved_share', 'first_submitted_at', 'last_submitted_at',
+]
+
+
+def hours_between(start, end):
+    return max((end - start).total_seconds(), 0) / 3600
+
+
+class Duration:
+    """Count, sum and whole-hour histogram of a set of durations given in hours."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.histogram = Counter()
+
+    def add(self, hours):
+        self.count += 1
+        self.total += hours
+        self.maximum = max(self.maximum, hours)
+        self.histogram[int(hours)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram.update(other.histogram)
+
+    def percentile(self, fraction):
+        """
+        Upper bound, to the hour, of the duration below which ``fraction`` of
+        values fall. Never more than the largest duration seen.
+        """
+        target = math.ceil(self.count * fraction)
+        seen = 0
+        for hour in sorted(self.histogram):
+            seen += self.histogram[hour]
+            if seen >= target:
+                return min(hour + 1, self.maximum)
+        return None
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_hours': round(self.total / self.count, 2),
+            'median_hours': round(self.percentile(0.5), 2),
+            'p90_hours': round(self.percentile(0.9), 2),
+            'max_hours': round(self.maximum, 2),
+            'histogram_hours': {str(hour): n for hour, n in sorted(self.histogram.items())},
+        }
+
+
+class CohortReport:
+    """Aggregates for some or all of a cohort's applicants; see ``merge``."""
+
+    def __init__(self, mandatory_required):
+        self.mandatory_required = mandatory_required
+        self.applicants = 0
+        self.finalized = 0
+        self.reached_mandatory = 0
+        self.submissions = 0
+        self.difficulty_submissions = Counter()
+        self.difficulty_applicants = Counter()
+        # question_id -> [submissions, first_submitted_at, last_submitted_at]
+        self.questions = {}
+        self.submissions_per_applicant = Counter()
+        self.mandatory_per_applicant = Counter()
+        self.to_mandatory = Duration()
+        self.to_finalize = Duration()
+
+    def add_applicant(self, applicant, submissions, writer):
+        """
+        Fold one applicant into the report and write their CSV row.
+        ``submissions`` are their rows ordered by submitted_at.
+        """
+        pk, username, first_name, last_name, email, date_joined, is_finalized, finalized_at = applicant
+        if not is_finalized:
+            # A snapshot left behind after an admin cleared is_finalized is not a finalization.
+            finalized_at = None
+        total = mandatory = 0
+        by_difficulty = Counter()
+        first_at = last_at = reached_at = None
+
+        for _, question_id, q_type, difficulty, submitted_at in submissions:
+            total += 1
+            by_difficulty[difficulty] += 1
+            if q_type == Question.QuestionType.MANDATORY:
+                mandatory += 1
+                if mandatory == self.mandatory_required:
+                    reached_at = submitted_at
+            first_at = first_at or submitted_at
+            last_at = submitted_at
+
+            stats = self.questions.get(question_id)
+            if stats is None:
+                self.questions[question_id] = [1, submitted_at, submitted_at]
+            else:
+                stats[0] += 1
+                stats[1] = min(stats[1], submitted_at)
+                stats[2] = max(stats[2], submitted_at)
+
+        self.applicants += 1
+        self.submissions += total
+        self.difficulty_submissions.update(by_difficulty)
+        self.difficulty_applicants.update(by_difficulty.keys())
+        self.submissions_per_applicant[total] += 1
+        self.mandatory_per_applicant[mandatory] += 1
+
+        hours_to_mandatory = hours_to_finalize = None
+        if reached_at is not None:
+            self.reached_mandatory += 1
+            hours_to_mandatory = hours_between(date_joined, reached_at)
+            self.to_mandatory.add(hours_to_mandatory)
+        if is_finalized:
+            self.finalized += 1
+        if finalized_at is not None:
+            hours_to_finalize = hours_between(date_joined, finalized_at)
+            self.to_finalize.add(hours_to_finalize)
+
+        writer.writerow([
+            pk, username, f'{first_name} {last_name}'.strip(), email, date_joined.isoformat(),
+            total, mandatory,
+            by_difficulty[Question.Difficulty.EASY],
+            by_difficulty[Question.Difficulty.MEDIUM],
+            by_difficulty[Question.Difficulty.HARD],
+            first_at.isoformat() if first_at else '',
+            last_at.isoformat() if last_at else '',
+            reached_at.isoformat() if reached_at else '',
+            '' if hours_to_mandatory is None else round(hours_to_mandatory, 2),
+            is_finalized,
+            finalized_at.isoformat() if finalized_at else '',
+            '' if hours_to_finalize is None else round(hours_to_finalize, 2),
+        ])
+
+    def merge(self, other):
+        """Add the aggregates of a report over a disjoint set of applicants."""
+        self.applicants += other.applicants
+        self.finalized += other.finalized
+        self.reached_mandatory += other.reached_mandatory
+        self.submissions += other.submissions
+        self.difficulty_submissions.update(other.difficulty_submissions)
+        self.difficulty_applicants.update(other.difficulty_applicants)
+        for question_id, (count, first_at, last_at) in other.questions.items():
+            stats = self.questions.get(question_id)
+            if stats is None:
+                self.questions[question_id] = [count, first_at, last_at]
+            else:
+                stats[0] += count
+                stats[1] = min(stats[1], first_at)
+                stats[2] = max(stats[2], last_at)
+        self.submissions_per_applicant.update(other.submissions_per_applicant)
+        self.mandatory_per_applicant.update(other.mandatory_per_applicant)
+        self.to_mandatory.merge(other.to_mandatory)
+        self.to_finalize.merge(other.to_finalize)
+
+    def summary(self, cohort):
+        mandatory_required, total_questions = cohort_thresholds(cohort)
+        return {
+            'cohort': {
+                'id': cohort.pk if cohort else None,
+                'name': cohort.name if cohort else None,
+                'mandatory_required': mandatory_required,
+                'total_questions': total_questions,
+            },
+            'applicants': self.applicants,
+            'finalized': self.finalized,
+            'reached_mandatory': self.reached_mandatory,
+            'submissions': self.submissions,
+            'difficulty': {
+                difficulty: {
+                    'submissions': self.difficulty_submissions[difficulty],
+                    'applicants': self.difficulty_applicants[difficulty],
+                }
+                for difficulty in Question.Difficulty.values
+            },
+            'submissions_per_applicant': {
+                str(count): n for count, n in sorted(self.submissions_per_applicant.items())
+            },
+            'mandatory_per_applicant': {
+                str(count): n for count, n in sorted(self.mandatory_per_applicant.items())
+            },
+            'hours_to_mandatory': self.to_mandatory.summary(),
+            'hours_to_finalize': self.to_finalize.summary(),
+        }
+
+    def write_questions(self, cohort, output):
+        """Write one CSV row per question of the cohort, most solved first."""
+        writer = csv.writer(output)
+        writer.writerow(QUESTION_COLUMNS)
+        questions = Question.objects.filter(cohort=cohort).values_list(
+            'pk', 'title', 'q_type', 'difficulty', 'is_active'
+        )
+        rows = []
+        for pk, title, q_type, difficulty, is_active in questions:
+            count, first_at, last_at = self.questions.get(pk, (0, None, None))
+            share = round(count / self.applicants, 4) if self.applicants else 0
+            rows.append([
+                pk, title, q_type, difficulty, is_active, count, share,
+                first_at.isoformat() if first_at else '',
+                last_at.isoformat() if last_at else '',
+            ])
+        rows.sort(key=lambda row: (-row[5], row[0]))
+        writer.writerows(rows)
+
+
+def applicant_ranges(cohort, parts):
+    """
+    Split the cohort's applicant ids into at most ``parts`` contiguous
+    ``(low, high)`` ranges of similar size. ``high`` is exclusive and is
+    None for the last range.
+    """
+    ids = User.objects.filter(cohort=cohort, role=User.Roles.APPLICANT).order_by('pk').values_list('pk', flat=True)
+    total = ids.count()
+    if not total:
+        return []
+    size = math.ceil(total / max(parts, 1))
+    lows = [ids[offset] for offset in range(0, total, size)]
+    return list(zip(lows, lows[1:] + [None]))
+
+
+def aggregate_range(cohort_pk, low, high, applicants_path, chunk_size):
+    """
+    Aggregate the applicants with ``low <= id < high`` and write their rows,
+    without a header, to ``applicants_path``. Returns a CohortReport.
+
+    This is the unit of work of a cohort_report worker process, so it takes
+    plain values and loads everything it needs itself.
+    """
+    cohort = Cohort.objects.filter(pk=cohort_pk).first()
+    mandatory_required, _ = cohort_thresholds(cohort)
+    report = CohortReport(mandatory_required)
+
+    applicants = User.objects.filter(cohort=cohort, role=User.Roles.APPLICANT, pk__gte=low)
+    submissions = Submission.objects.filter(
+        cohort=cohort, user__role=User.Roles.APPLICANT, user_id__gte=low
+    )
+    if high is not None:
+        applicants = applicants.filter(pk__lt=high)
+        submissions = submissions.filter(user_id__lt=high)
+
+    applicant_rows = applicants.order_by('pk').values_list(
+        'pk', 'username', 'first_name', 'last_name', 'email',
+        'date_joined', 'is_finalized', 'snapshot__finalized_at',
+    ).iterator(chunk_size=chunk_size)
+    submission_rows = submissions.order_by('user_id', 'submitted_at', 'pk').values_list(
+        'user_id', 'question_id', 'question__q_type', 'question__difficulty', 'submitted_at',
+    ).iterator(chunk_size=chunk_size)
+
+    # Both streams are ordered by applicant id, so they can be merged like sorted lists.
+    grouped = groupby(submission_rows, key=itemgetter(0))
+    current = next(grouped, None)
+    with open(applicants_path, 'w', encoding='utf-8', newline='') as output:
+        writer = csv.writer(output)
+        for applicant in applicant_rows:
+            while current is not None and current[0] < applicant[0]:
+                current = next(grouped, None)
+            if current is not None and current[0] == applicant[0]:
+                report.add_applicant(applicant, current[1], writer)
+            else:
+                report.add_applicant(applicant, (), writer)
+    return report
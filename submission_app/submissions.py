@@ -0,0 +1,106 @@
+"""
+Write path for applicant submissions.
+
+Near deadlines the same (user, question) write often arrives several times
+at once: double-clicks, browser retries, flaky connections. The row is
+written with a single ``INSERT ... ON CONFLICT DO UPDATE`` so a race on the
+unique constraint cannot fail, under the applicant row lock that finalize
+also takes. Serialization failures and deadlocks are retried a bounded number
+of times; an IntegrityError is a real error and is not.
+Clients may also send an idempotency key. It is stored (hashed) on the row,
+so a repeat of a keyed request is recognised under the same lock, whichever
+worker process it reaches, and is answered without writing again.
+"""
+import hashlib
+import random
+import time
+
+from django.db import OperationalError, transaction
+from django.db.models import F
+
+from .links import link_hash
+from .models import Submission, User
+
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 0.05
+
+CREATED = 'submitted'
+UPDATED = 'updated'
+# A repeat of a request that was already saved
+REPLAYED = 'saved'
+
+# Columns rewritten when the (user, question) row already exists. submitted_at
+# is left out so the original submission time is kept.
+UPSERT_FIELDS = [
+    'submission_link', 'link_hash', 'idempotency_key', 'cohort', 'verification_status', 'verified_at',
+]
+
+
+class ApplicationFinalized(Exception):
+    """The applicant's application is finalized and can no longer change."""
+
+
+class CohortClosed(Exception):
+    """The applicant's cohort is being archived and takes no more writes."""
+
+
+def record_submission(user, question, submission_link, idempotency_key=None):
+    """
+    Save ``submission_link`` as ``user``'s answer to ``question``.
+
+    Returns CREATED or UPDATED, or REPLAYED when the row was last written by
+    a request with the same idempotency key and link. Raises
+    ApplicationFinalized if the application is already finalized, or
+    CohortClosed if the cohort is being archived.
+    """
+    key_hash = hashlib.sha256(idempotency_key.encode('utf-8')).hexdigest() if idempotency_key else ''
+    # A retry needs its own transaction; inside an outer one the error must propagate.
+    attempts = 1 if transaction.get_connection().in_atomic_block else MAX_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        try:
+            return _write(user, question, submission_link, key_hash)
+        except OperationalError:
+            # Serialization failures, deadlocks and lock timeouts under contention
+            if attempt == attempts:
+                raise
+            time.sleep(RETRY_DELAY * attempt * random.uniform(1, 2))
+
+
+def _write(user, question, submission_link, key_hash):
+    with transaction.atomic():
+        # Lock the applicant row so a concurrent finalize cannot snapshot around this write
+        is_finalized, archived_at = User.objects.select_for_update(of=('self',)).values_list(
+            'is_finalized', 'cohort__archived_at'
+        ).get(pk=user.pk)
+        if is_finalized:
+            raise ApplicationFinalized
+        if archived_at is not None:
+            raise CohortClosed
+
+        new_hash = link_hash(submission_link)
+        current = Submission.objects.filter(
+            user=user, question=question
+        ).values_list('link_hash', 'idempotency_key').first()
+        if key_hash and current == (new_hash, key_hash):
+            return REPLAYED
+
+        # The read above only decides the result; the upsert below is what
+        # keeps concurrent writers off the unique constraint.
+        Submission.objects.bulk_create(
+            [Submission(
+                user=user,
+                question=question,
+                cohort=question.cohort,
+                submission_link=submission_link,
+                link_hash=new_hash,
+                idempotency_key=key_hash,
+                verification_status=Submission.VerificationStatus.PENDING,
+                verified_at=None,
+            )],
+            update_conflicts=True,
+            unique_fields=['user', 'question'],
+            update_fields=UPSERT_FIELDS,
+        )
+        User.objects.filter(pk=user.pk).update(progress_version=F('progress_version') + 1)
+    return CREATED if current is None else UPDATED
@@ -1,3 +1,829 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, OperationalError, connections
+from django.db.models import F, QuerySet
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import archive, middleware, reporting, submissions, verification, warmup
+from .admin import EstimatedCountPaginator
+from .catalog import get_catalog
+from .forms import SubmissionForm
+from .links import link_hash
+from .management.commands import archive_cohort, cohort_report, verify_submissions
+from .models import ApplicationSnapshot, Cohort, InvitationToken, Question, Submission, User
+from .submissions import CohortClosed, record_submission
+
+
+def make_question(cohort, title='Two Sum', **fields):
+    fields = {
+        'leetcode_link': 'https://leetcode.com/problems/two-sum/',
+        'q_type': Question.QuestionType.MANDATORY,
+        'difficulty': Question.Difficulty.EASY,
+        **fields,
+    }
+    return Question.objects.create(cohort=cohort, title=title, **fields)
+
+
+def make_applicant(cohort, username='a@example.com', **fields):
+    return User.objects.create_user(
+        username=username, email=username, password='secret123', cohort=cohort, **fields
+    )
+
+
+def make_admin():
+    return User.objects.create_user(username='admin', password='secret123', role=User.Roles.ADMIN)
+
+
+def change_user_in_admin(user, **changes):
+    """Save ``user`` through the Django admin change form, as staff would."""
+    client = Client()
+    client.force_login(User.objects.get_or_create(username='staff', is_staff=True, is_superuser=True)[0])
+    user = User.objects.get(pk=user.pk)
+    data = {
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'email': user.email,
+        'is_active': 'on',
+        'date_joined_0': f'{user.date_joined:%Y-%m-%d}',
+        'date_joined_1': f'{user.date_joined:%H:%M:%S}',
+        'role': user.role,
+        'cohort': user.cohort_id,
+        **changes,
+    }
+    # Unchecked checkboxes are simply absent from a submitted form.
+    data = {name: value for name, value in data.items() if value not in (None, False)}
+    return client.post(reverse('admin:submission_app_user_change', args=[user.pk]), data)
+
+
+class CohortFixture:
+    """Test case mixin: ``self.cohort`` with one mandatory question and one applicant."""
+    cohort_name = '2026 Cycle'
+    cohort_is_active = True
+
+    def setUp(self):
+        super().setUp()
+        self.cohort = Cohort.objects.create(name=self.cohort_name, is_active=self.cohort_is_active)
+        self.question = make_question(self.cohort)
+        self.applicant = make_applicant(self.cohort)
+
+
+class RegistrationTests(TestCase):
+    def setUp(self):
+        self.old_cohort = Cohort.objects.create(name='2025 Cycle')
+        self.cohort = Cohort.objects.create(name='2026 Cycle', is_active=True)
+        make_applicant(self.old_cohort, 'returning@example.com')
+
+    def test_existing_account_is_rejected_without_consuming_invitation(self):
+        invitation = InvitationToken.objects.create(
+            token='ABC123', email='returning@example.com', cohort=self.cohort,
+            expiry_date=timezone.now() + timedelta(days=7),
+        )
+        response = self.client.post(reverse('register'), {
+            'token': 'ABC123', 'name': 'Returning', 'email': 'returning@example.com',
+            'password': 'secret123', 'password_confirm': 'secret123',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'already exists')
+        invitation.refresh_from_db()
+        self.assertFalse(invitation.used)
+        self.assertEqual(User.objects.get(username='returning@example.com').cohort, self.old_cohort)
+
+    def test_create_invite_skips_existing_account(self):
+        call_command('create_invite', 'returning@example.com', 'new@example.com', stdout=StringIO())
+        self.assertEqual(
+            list(InvitationToken.objects.values_list('email', flat=True)), ['new@example.com']
+        )
+
+
+class ArchiveTests(CohortFixture, TestCase):
+    cohort_name = '2025 Cycle'
+    cohort_is_active = False
+
+    def setUp(self):
+        super().setUp()
+        self.archive_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.archive_root)
+        archive_settings = override_settings(ARCHIVE_ROOT=self.archive_root)
+        archive_settings.enable()
+        self.addCleanup(archive_settings.disable)
+
+        Cohort.objects.create(name='2026 Cycle', is_active=True)
+        record_submission(self.applicant, self.question, 'https://leetcode.com/submissions/detail/1/')
+
+    def test_writes_are_rejected_once_archiving_starts(self):
+        self.cohort.archived_at = timezone.now()
+        self.cohort.save(update_fields=['archived_at'])
+
+        with self.assertRaises(CohortClosed):
+            record_submission(self.applicant, self.question, 'https://leetcode.com/submissions/detail/2/')
+
+    def test_rerun_resumes_an_interrupted_archive(self):
+        with mock.patch.object(archive_cohort.Command, 'delete_in_batches', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                call_command('archive_cohort', '2025 Cycle', stdout=StringIO())
+        self.cohort.refresh_from_db()
+        self.assertIsNotNone(self.cohort.archived_at)
+
+        call_command('archive_cohort', '2025 Cycle', stdout=StringIO())
+        self.assertFalse(User.objects.filter(cohort=self.cohort).exists())
+        self.assertFalse(Submission.objects.filter(cohort=self.cohort).exists())
+
+        call_command('restore_cohort', '2025 Cycle', stdout=StringIO())
+        self.assertEqual(Submission.objects.filter(cohort=self.cohort).count(), 1)
+
+    def test_archive_file_is_private(self):
+        call_command('archive_cohort', '2025 Cycle', stdout=StringIO())
+        self.assertEqual(archive.archive_path(self.cohort).stat().st_mode & 0o777, 0o600)
+
+    def test_archive_requires_an_explicit_root(self):
+        with override_settings(ARCHIVE_ROOT=None), self.assertRaisesMessage(CommandError, 'ARCHIVE_ROOT is not set'):
+            call_command('archive_cohort', '2025 Cycle', stdout=StringIO())
+        self.cohort.refresh_from_db()
+        self.assertIsNone(self.cohort.archived_at)
+
+    def test_restore_refuses_rows_that_clash_with_new_ones(self):
+        call_command('archive_cohort', '2025 Cycle', stdout=StringIO())
+        # The same applicant signs up again for the next cohort.
+        returning = make_applicant(Cohort.objects.get(name='2026 Cycle'))
+
+        with self.assertRaisesMessage(CommandError, f'username a@example.com is taken by user id {returning.pk}'):
+            call_command('restore_cohort', '2025 Cycle', stdout=StringIO())
+        self.cohort.refresh_from_db()
+        self.assertIsNotNone(self.cohort.archived_at)
+        self.assertTrue(archive.archive_path(self.cohort).exists())
+        self.assertFalse(Submission.objects.filter(cohort=self.cohort).exists())
+
+    def test_restore_reopens_a_cohort_whose_archive_never_finished(self):
+        self.cohort.archived_at = timezone.now()
+        self.cohort.save(update_fields=['archived_at'])
+
+        call_command('restore_cohort', '2025 Cycle', stdout=StringIO())
+        self.cohort.refresh_from_db()
+        self.assertIsNone(self.cohort.archived_at)
+
+    def test_export_rejects_a_non_numeric_cohort(self):
+        self.client.force_login(make_admin())
+        response = self.client.get(reverse('export_applicants'), {'cohort': 'abc'})
+        self.assertEqual(response.status_code, 404)
+
+
+class LinkTests(TestCase):
+    def test_invalid_port_is_a_validation_error(self):
+        form = SubmissionForm({'submission_link': 'https://leetcode.com:99999/x'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('submission_link', form.errors)
+
+    def test_link_hash_accepts_invalid_port(self):
+        self.assertEqual(len(link_hash('https://leetcode.com:99999/x')), 64)
+
+
+class StubLeetCodeHandler(BaseHTTPRequestHandler):
+    """Serves canned pages and records every path it was asked for."""
+    pages = {
+        '/submissions/detail/1/': (200, b'<a href="/problems/two-sum/">Two Sum</a>'),
+        '/submissions/detail/2/': (200, b'<h1>Accepted</h1>'),
+        '/moved/': (301, b''),
+    }
+
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        if self.path == '/leave/':
+            self.send_response(302)
+            self.send_header('Location', f'http://localhost:{self.server.server_port}/internal/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        status, body = self.pages.get(self.path, (404, b'not found'))
+        self.send_response(status)
+        if status == 301:
+            self.send_header('Location', '/submissions/detail/1/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class InlineExecutor:
+    """Thread or process pool stand-in that runs every mapped call on the calling thread."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, function, *iterables):
+        return map(function, *iterables)
+
+
+class VerifySubmissionsTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubLeetCodeHandler)
+        self.server.requested = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f'http://127.0.0.1:{self.server.server_port}'
+
+        allowed = mock.patch.multiple(
+            verification,
+            ALLOWED_SCHEMES=('http',),
+            ALLOWED_HOSTS=('127.0.0.1',),
+            ALLOWED_PORTS=(self.server.server_port,),
+        )
+        allowed.start()
+        self.addCleanup(allowed.stop)
+
+        cohort = Cohort.objects.create(name='2026 Cycle', is_active=True)
+        self.applicant = make_applicant(cohort)
+        self.questions = [make_question(cohort, f'Question {index}') for index in range(6)]
+
+    def submit(self, question, link):
+        record_submission(self.applicant, question, link)
+        return Submission.objects.get(user=self.applicant, question=question)
+
+    def test_links_are_classified_end_to_end(self):
+        Status = Submission.VerificationStatus
+        submissions = {
+            Status.VERIFIED: self.submit(self.questions[0], f'{self.base}/submissions/detail/1/'),
+            Status.REACHABLE: self.submit(self.questions[1], f'{self.base}/submissions/detail/2/'),
+            Status.UNREACHABLE: self.submit(self.questions[2], f'{self.base}/missing/'),
+            Status.MISMATCH: self.submit(self.questions[3], f'{self.base}/problems/add-two-numbers/'),
+        }
+        redirected = self.submit(self.questions[4], f'{self.base}/moved/')
+
+        call_command('verify_submissions', '--concurrency', '4', stdout=StringIO())
+
+        for expected, submission in submissions.items():
+            submission.refresh_from_db()
+            self.assertEqual(submission.verification_status, expected, submission.submission_link)
+            self.assertIsNotNone(submission.verified_at)
+        redirected.refresh_from_db()
+        self.assertEqual(redirected.verification_status, Status.VERIFIED)
+
+    def test_hosts_outside_the_allow_list_are_never_requested(self):
+        direct = self.submit(self.questions[0], f'http://localhost:{self.server.server_port}/internal/')
+        redirect = self.submit(self.questions[1], f'{self.base}/leave/')
+
+        call_command('verify_submissions', stdout=StringIO())
+
+        for submission in (direct, redirect):
+            submission.refresh_from_db()
+            self.assertEqual(submission.verification_status, Submission.VerificationStatus.UNSUPPORTED)
+        self.assertEqual(self.server.requested, ['/leave/'])
+
+    def test_resubmission_during_a_check_is_not_overwritten(self):
+        submission = self.submit(self.questions[0], f'{self.base}/submissions/detail/1/')
+        new_link = f'{self.base}/submissions/detail/2/'
+
+        def resubmit_while_checking(pool, submission_link, problem_link):
+            record_submission(self.applicant, self.questions[0], new_link)
+            return Submission.VerificationStatus.VERIFIED
+
+        with mock.patch.object(verify_submissions, 'ThreadPoolExecutor', InlineExecutor), \
+                mock.patch.object(verify_submissions, 'verify_link', resubmit_while_checking):
+            call_command('verify_submissions', stdout=StringIO())
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.submission_link, new_link)
+        self.assertEqual(submission.verification_status, Submission.VerificationStatus.PENDING)
+        self.assertIsNone(submission.verified_at)
+
+
+class CatalogTests(CohortFixture, TestCase):
+    def test_version_bump_from_another_process_is_seen(self):
+        self.assertEqual(get_catalog(self.cohort)['mandatory'], [self.question])
+
+        # Simulate another process: change the questions and bump the stamp
+        # without touching this process's cache.
+        Question.objects.filter(pk=self.question.pk).update(is_active=False)
+        Cohort.objects.filter(pk=self.cohort.pk).update(questions_version=F('questions_version') + 1)
+
+        self.assertEqual(get_catalog(Cohort.objects.get(pk=self.cohort.pk))['mandatory'], [])
+
+
+class QuestionImportExportTests(CohortFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def import_rows(self, rows, *args):
+        path = self.directory / 'questions.json'
+        path.write_text(json.dumps(rows), encoding='utf-8')
+        output = StringIO()
+        call_command('import_questions', str(path), *args, stdout=output)
+        return output.getvalue()
+
+    def test_export_writes_to_the_command_stdout(self):
+        output = StringIO()
+        call_command('export_questions', stdout=output)
+        rows = list(csv.DictReader(StringIO(output.getvalue())))
+        self.assertEqual([row['title'] for row in rows], ['Two Sum'])
+
+        output = StringIO()
+        call_command('export_questions', '--format', 'json', stdout=output)
+        self.assertEqual(json.loads(output.getvalue())[0]['leetcode_link'], self.question.leetcode_link)
+
+    def test_export_round_trips_into_another_cohort(self):
+        make_question(self.cohort, 'LRU Cache', leetcode_link='https://leetcode.com/problems/lru-cache/',
+                      q_type=Question.QuestionType.RECOMMENDED, difficulty=Question.Difficulty.MEDIUM)
+        path = self.directory / 'questions.csv'
+        call_command('export_questions', '--output', str(path), stdout=StringIO())
+        Cohort.objects.create(name='2027 Cycle')
+
+        call_command('import_questions', str(path), '--cohort', '2027 Cycle', stdout=StringIO())
+
+        fields = ('title', 'leetcode_link', 'q_type', 'difficulty', 'is_active')
+        self.assertEqual(
+            list(Question.objects.filter(cohort__name='2027 Cycle').order_by('title').values_list(*fields)),
+            list(Question.objects.filter(cohort=self.cohort).order_by('title').values_list(*fields)),
+        )
+
+    def test_import_matches_existing_questions_by_normalized_link(self):
+        rows = [{
+            'title': 'Two Sum', 'leetcode_link': 'https://www.leetcode.com/problems/two-sum?utm_source=x',
+            'q_type': 'MANDATORY', 'difficulty': 'MEDIUM',
+        }]
+        self.import_rows(rows, '--dry-run')
+        self.assertEqual(Question.objects.get().difficulty, Question.Difficulty.EASY)
+
+        self.import_rows(rows)
+        self.assertEqual(Question.objects.get().difficulty, Question.Difficulty.MEDIUM)
+
+    def test_import_tolerates_stored_links_that_do_not_parse(self):
+        Question.objects.filter(pk=self.question.pk).update(leetcode_link='https://leetcode.com:99999/problems/two-sum/')
+
+        self.import_rows([{
+            'title': 'LRU Cache', 'leetcode_link': 'https://leetcode.com/problems/lru-cache/',
+            'q_type': 'RECOMMENDED', 'difficulty': 'MEDIUM',
+        }], '--deactivate-missing')
+
+        self.question.refresh_from_db()
+        self.assertFalse(self.question.is_active)
+        self.assertTrue(Question.objects.get(title='LRU Cache').is_active)
+
+    def test_import_rejects_an_incoming_link_with_an_invalid_port(self):
+        with self.assertRaisesMessage(CommandError, 'Row 1 is invalid (leetcode_link'):
+            self.import_rows([{
+                'title': 'Broken', 'leetcode_link': 'https://leetcode.com:99999/problems/broken/',
+                'q_type': 'MANDATORY', 'difficulty': 'EASY',
+            }])
+
+
+class SweepInvitationsTests(TestCase):
+    def test_only_closed_cohorts_lose_their_live_tokens(self):
+        call_command('create_cohort', '2025 Cycle', '--activate', stdout=StringIO())
+        call_command('create_invite', 'old@example.com', stdout=StringIO())
+        call_command('create_cohort', '2026 Cycle', '--activate', stdout=StringIO())
+        call_command('create_cohort', '2027 Cycle', stdout=StringIO())
+        call_command('create_invite', 'early@example.com', '--cohort', '2027 Cycle', stdout=StringIO())
+
+        call_command('sweep_invitations', stdout=StringIO())
+
+        live = InvitationToken.objects.filter(expiry_date__gt=timezone.now())
+        self.assertEqual(list(live.values_list('email', flat=True)), ['early@example.com'])
+
+
+class SnapshotBackfillTests(CohortFixture, TestCase):
+    def test_finalized_applicants_without_a_snapshot_get_one(self):
+        applicant, question = self.applicant, self.question
+        record_submission(applicant, question, 'https://leetcode.com/submissions/detail/1/')
+        User.objects.filter(pk=applicant.pk).update(is_finalized=True)
+
+        backfill = import_module('submission_app.migrations.0012_backfill_application_snapshots')
+        backfill.snapshot_finalized_applicants(django_apps, None)
+
+        snapshot = ApplicationSnapshot.objects.get(user=applicant)
+        self.assertEqual((snapshot.mandatory_count, snapshot.total_count), (1, 1))
+        self.assertEqual(snapshot.submissions[0]['question_id'], question.pk)
+
+        self.client.force_login(make_admin())
+        response = self.client.get(reverse('application_review', args=[applicant.pk]))
+        self.assertEqual(response.status_code, 200)
+
+
+class FinalizeTests(CohortFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        Cohort.objects.filter(pk=self.cohort.pk).update(mandatory_required=1)
+        self.client.force_login(self.applicant)
+
+    def submit(self, link):
+        return self.client.post(reverse('submit_question', args=[self.question.pk]), {'submission_link': link})
+
+    def test_finalize_requires_the_mandatory_threshold(self):
+        response = self.client.post(reverse('finalize_application'))
+
+        self.assertRedirects(response, reverse('applicant_dashboard'), fetch_redirect_response=False)
+        self.assertFalse(User.objects.get(pk=self.applicant.pk).is_finalized)
+        self.assertFalse(ApplicationSnapshot.objects.exists())
+
+    def test_finalize_locks_submissions(self):
+        self.submit('https://leetcode.com/submissions/detail/1/')
+        self.client.post(reverse('finalize_application'))
+        self.submit('https://leetcode.com/submissions/detail/2/')
+
+        self.assertTrue(User.objects.get(pk=self.applicant.pk).is_finalized)
+        snapshot = ApplicationSnapshot.objects.get(user=self.applicant)
+        self.assertEqual((snapshot.mandatory_count, snapshot.total_count), (1, 1))
+        self.assertEqual(
+            Submission.objects.get(user=self.applicant).submission_link,
+            'https://leetcode.com/submissions/detail/1',
+        )
+
+    def test_finalize_again_after_an_admin_reopens_the_application(self):
+        self.submit('https://leetcode.com/submissions/detail/1/')
+        self.client.post(reverse('finalize_application'))
+
+        response = change_user_in_admin(self.applicant, is_finalized=False)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(ApplicationSnapshot.objects.exists())
+
+        self.submit('https://leetcode.com/submissions/detail/2/')
+        response = self.client.post(reverse('finalize_application'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(User.objects.get(pk=self.applicant.pk).is_finalized)
+        snapshot = ApplicationSnapshot.objects.get(user=self.applicant)
+        self.assertEqual(snapshot.submissions[0]['submission_link'], 'https://leetcode.com/submissions/detail/2')
+
+
+class EstimatedCountPaginatorTests(CohortFixture, TestCase):
+    def paginator(self, queryset):
+        return EstimatedCountPaginator(queryset, 50)
+
+    @contextmanager
+    def planner_estimate(self, rows):
+        """Pretend to be PostgreSQL with a planner that expects ``rows`` rows."""
+        plan = json.dumps({'Plan': {'Node Type': 'Index Scan', 'Plan Rows': rows}})
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'), \
+                mock.patch.object(QuerySet, 'explain', return_value=plan) as explain:
+            yield explain
+
+    def test_other_databases_count_exactly(self):
+        record_submission(self.applicant, self.question, 'https://leetcode.com/submissions/detail/1/')
+        self.assertEqual(self.paginator(Submission.objects.filter(cohort=self.cohort)).count, 1)
+
+    def test_large_filtered_list_uses_the_planner_estimate(self):
+        with self.planner_estimate(250000) as explained:
+            count = self.paginator(Submission.objects.filter(cohort=self.cohort)).count
+
+        self.assertEqual(count, 250000)
+        explained.assert_called_once_with(format='json')
+
+    def test_small_filtered_list_is_counted_exactly(self):
+        record_submission(self.applicant, self.question, 'https://leetcode.com/submissions/detail/1/')
+        with self.planner_estimate(40):
+            count = self.paginator(Submission.objects.filter(cohort=self.cohort)).count
+
+        self.assertEqual(count, 1)
+
+    def test_filtered_changelist_pages_on_the_estimate(self):
+        staff = User.objects.create_superuser(username='staff', password='secret123')
+        self.client.force_login(staff)
+        with self.planner_estimate(250000):
+            response = self.client.get(
+                reverse('admin:submission_app_submission_changelist'), {'cohort__id__exact': self.cohort.pk},
+            )
+
+        self.assertEqual(response.context['cl'].result_count, 250000)
+
+
+class InvitationAdminTests(TestCase):
+    def setUp(self):
+        staff = User.objects.create_superuser(username='staff', password='secret123')
+        self.client.force_login(staff)
+        closed = Cohort.objects.create(name='2025 Cycle', closed_at=timezone.now())
+        cohort = Cohort.objects.create(name='2026 Cycle', is_active=True)
+        self.expiry_date = timezone.now() + timedelta(days=1)
+        self.open = InvitationToken.objects.create(
+            token='OPEN01', email='open@example.com', cohort=cohort, expiry_date=self.expiry_date,
+        )
+        self.closed = InvitationToken.objects.create(
+            token='SHUT01', email='closed@example.com', cohort=closed, expiry_date=self.expiry_date,
+        )
+
+    def run_action(self, action, *invitations):
+        return self.client.post(reverse('admin:submission_app_invitationtoken_changelist'), {
+            'action': action,
+            '_selected_action': [invitation.pk for invitation in invitations],
+        }, follow=True)
+
+    def test_resend_skips_closed_cohorts(self):
+        response = self.run_action('resend_invitations', self.open, self.closed)
+
+        self.assertContains(response, 'Resent 1 invitation(s); skipped 1 of closed cohorts.')
+        self.assertEqual([message.to for message in mail.outbox], [['open@example.com']])
+        self.open.refresh_from_db()
+        self.closed.refresh_from_db()
+        self.assertGreater(self.open.expiry_date, self.expiry_date + timedelta(days=5))
+        self.assertEqual(self.closed.expiry_date, self.expiry_date)
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.console.EmailBackend', DEBUG=False)
+    def test_resend_refuses_the_console_backend_in_production(self):
+        response = self.run_action('resend_invitations', self.open)
+
+        self.assertContains(response, 'Email is not configured')
+        self.open.refresh_from_db()
+        self.assertEqual(self.open.expiry_date, self.expiry_date)
+
+    def test_expire_only_touches_live_tokens(self):
+        used = InvitationToken.objects.create(
+            token='USED01', email='used@example.com', used=True, expiry_date=self.expiry_date,
+        )
+
+        response = self.run_action('expire_invitations', self.open, used)
+
+        self.assertContains(response, 'Expired 1 invitation(s).')
+        self.open.refresh_from_db()
+        used.refresh_from_db()
+        self.assertLessEqual(self.open.expiry_date, timezone.now())
+        self.assertEqual(used.expiry_date, self.expiry_date)
+
+
+@override_settings(WARMUP_ON_BOOT=False)
+class HealthCheckTests(TestCase):
+    def test_reports_database_and_pool(self):
+        response = self.client.get(reverse('health_check'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['database'], 'ok')
+        # Only with DB_POOL=True against PostgreSQL (see the README)
+        if getattr(connections['default'], 'pool', None) is not None:
+            self.assertIn('pool_size', response.json()['pool'])
+
+    def test_database_errors_are_not_exposed(self):
+        error = OperationalError('connection to server at "10.0.0.5", user "tracker" failed')
+        with mock.patch.object(connections['default'], 'cursor', side_effect=error), \
+                self.assertLogs('submission_app.views', 'ERROR'):
+            response = self.client.get(reverse('health_check'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'status': 'error', 'database': 'unavailable'})
+
+
+class WarmupTests(TestCase):
+    def test_compiles_every_template_without_errors(self):
+        output = StringIO()
+        # Closing connections would end the test transaction
+        with mock.patch.object(warmup, 'release_connections'), self.assertNoLogs('submission_app.warmup'):
+            call_command('warmup', stdout=output)
+
+        self.assertIn(f'Warmed up {len(warmup.TEMPLATES)} templates', output.getvalue())
+        self.assertTrue(warmup.is_ready())
+
+
+class ApplicantTrackerTests(CohortFixture, TestCase):
+    def test_admin_edits_invalidate_the_tracker_etag(self):
+        self.client.force_login(make_admin())
+        etag = self.client.get(reverse('applicant_tracker'))['ETag']
+        self.assertEqual(self.client.get(reverse('applicant_tracker'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        response = change_user_in_admin(self.applicant, first_name='Renamed')
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client.get(reverse('applicant_tracker'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed')
+
+
+class CompressionTests(CohortFixture, TestCase):
+    def test_html_is_never_sent_as_brotli(self):
+        self.client.force_login(self.applicant)
+        with mock.patch.object(middleware, 'brotli') as brotli:
+            response = self.client.get(reverse('applicant_dashboard'), HTTP_ACCEPT_ENCODING='br, gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        brotli.compress.assert_not_called()
+
+
+class ExportApplicantsTests(TestCase):
+    def test_export_streams_gzipped_csv(self):
+        cohort = Cohort.objects.create(name='2026 Cycle', is_active=True)
+        for index in range(3):
+            make_applicant(cohort, f'a{index}@example.com')
+        self.client.force_login(make_admin())
+
+        response = self.client.get(reverse('export_applicants'), HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(lines[0], 'Rank,Name,Email,Total Submissions,Finalized')
+        self.assertEqual(len(lines), 4)
+
+
+class ReportingTests(CohortFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        Cohort.objects.filter(pk=self.cohort.pk).update(mandatory_required=2)
+        self.cohort.refresh_from_db()
+        self.joined = timezone.now().replace(microsecond=0) - timedelta(days=1)
+
+        second = make_question(self.cohort, 'Add Two Numbers')
+        recommended = make_question(
+            self.cohort, 'LRU Cache', q_type=Question.QuestionType.RECOMMENDED,
+            difficulty=Question.Difficulty.MEDIUM,
+        )
+        # The applicant reaches the threshold 3 hours in and finalizes at 6 hours.
+        self.submit(self.applicant, self.question, hours=1)
+        self.submit(self.applicant, second, hours=3)
+        self.submit(self.applicant, recommended, hours=5)
+        User.objects.filter(pk=self.applicant.pk).update(is_finalized=True)
+        ApplicationSnapshot.objects.create(
+            user=self.applicant, cohort=self.cohort, finalized_at=self.joined + timedelta(hours=6),
+            mandatory_count=2, total_count=3,
+        )
+        self.partial = make_applicant(self.cohort, 'b@example.com')
+        self.submit(self.partial, recommended, hours=2)
+        self.idle = make_applicant(self.cohort, 'c@example.com')
+        User.objects.filter(cohort=self.cohort).update(date_joined=self.joined)
+
+    def submit(self, applicant, question, hours):
+        record_submission(applicant, question, f'https://leetcode.com/submissions/detail/{question.pk}/')
+        Submission.objects.filter(user=applicant, question=question).update(
+            submitted_at=self.joined + timedelta(hours=hours)
+        )
+
+    def report(self, low=0, high=None, name='applicants.csv'):
+        """Aggregate the applicants with low <= id < high."""
+        return reporting.aggregate_range(self.cohort.pk, low, high, self.output_dir / name, 100)
+
+    def rows(self, name='applicants.csv'):
+        with open(self.output_dir / name, encoding='utf-8', newline='') as output:
+            return {
+                int(row[0]): dict(zip(reporting.APPLICANT_COLUMNS, row))
+                for row in csv.reader(output)
+            }
+
+    def test_threshold_and_finalize_timing(self):
+        report = self.report()
+
+        row = self.rows()[self.applicant.pk]
+        self.assertEqual((row['submissions'], row['mandatory'], row['medium']), ('3', '2', '1'))
+        self.assertEqual(row['reached_mandatory_at'], (self.joined + timedelta(hours=3)).isoformat())
+        self.assertEqual((row['hours_to_mandatory'], row['hours_to_finalize']), ('3.0', '6.0'))
+        self.assertEqual((report.applicants, report.reached_mandatory, report.finalized), (3, 1, 1))
+        self.assertEqual(report.summary(self.cohort)['hours_to_mandatory']['max_hours'], 3.0)
+
+    def test_applicant_without_submissions(self):
+        report = self.report()
+
+        row = self.rows()[self.idle.pk]
+        self.assertEqual((row['submissions'], row['mandatory']), ('0', '0'))
+        self.assertEqual((row['first_submitted_at'], row['reached_mandatory_at'], row['finalized_at']), ('', '', ''))
+        self.assertEqual(report.submissions_per_applicant[0], 1)
+
+    def test_applicant_ranges_split_ids_evenly(self):
+        ids = sorted([self.applicant.pk, self.partial.pk, self.idle.pk])
+
+        self.assertEqual(reporting.applicant_ranges(self.cohort, 2), [(ids[0], ids[2]), (ids[2], None)])
+        self.assertEqual(len(reporting.applicant_ranges(self.cohort, 10)), 3)
+        self.assertEqual(reporting.applicant_ranges(Cohort.objects.create(name='Empty'), 2), [])
+
+    def test_merged_ranges_match_a_single_pass(self):
+        merged = reporting.CohortReport(self.cohort.mandatory_required)
+        parts = {}
+        for index, (low, high) in enumerate(reporting.applicant_ranges(self.cohort, 3)):
+            merged.merge(self.report(low, high, f'part{index}.csv'))
+            parts.update(self.rows(f'part{index}.csv'))
+
+        full = self.report()
+
+        self.assertEqual(merged.summary(self.cohort), full.summary(self.cohort))
+        self.assertEqual(merged.questions, full.questions)
+        self.assertEqual(parts, self.rows())
+
+    def test_worker_count_does_not_change_the_report(self):
+        outputs = {}
+        # Spawned workers would open their own connection and miss this test's
+        # transaction, so run the split ranges inline.
+        with mock.patch.object(cohort_report, 'ProcessPoolExecutor', InlineExecutor):
+            for workers in (1, 3):
+                output_dir = self.output_dir / f'workers-{workers}'
+                call_command(
+                    'cohort_report', '--workers', str(workers), '--output-dir', str(output_dir), stdout=StringIO(),
+                )
+                summary = json.loads((output_dir / 'summary.json').read_text())
+                del summary['generated_at']
+                outputs[workers] = (
+                    summary,
+                    (output_dir / 'applicants.csv').read_text(),
+                    (output_dir / 'questions.csv').read_text(),
+                )
+
+        self.assertEqual(outputs[1], outputs[3])
+        self.assertEqual(outputs[1][0]['applicants'], 3)
+
+    def test_percentiles_never_exceed_the_maximum(self):
+        duration = reporting.Duration()
+        for hours in (0.0, 0.0, 0.25):
+            duration.add(hours)
+
+        summary = duration.summary()
+        self.assertEqual((summary['median_hours'], summary['p90_hours'], summary['max_hours']), (0.25, 0.25, 0.25))
+
+    def test_leftover_snapshot_of_an_unfinalized_applicant_is_not_counted(self):
+        ApplicationSnapshot.objects.create(
+            user=self.partial, cohort=self.cohort, mandatory_count=0, total_count=1,
+        )
+
+        report = self.report()
+
+        self.assertEqual(report.finalized, 1)
+        self.assertEqual(report.to_finalize.count, 1)
+        self.assertEqual(self.rows()[self.partial.pk]['finalized_at'], '')
+
+
+class ConcurrentSubmissionTests(CohortFixture, TransactionTestCase):
+    """Runs against the configured database; run it on PostgreSQL too (see the README)."""
+    threads = 24
+
+    def hammer(self, link_for, key_for):
+        """Call record_submission for the same (user, question) from many threads at once."""
+        barrier = threading.Barrier(self.threads)
+        results, errors = [], []
+
+        def submit(index):
+            try:
+                barrier.wait()
+                results.append(record_submission(self.applicant, self.question, link_for(index), key_for(index)))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=submit, args=(index,)) for index in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_concurrent_submissions_leave_one_row(self):
+        results = self.hammer(lambda index: f'https://leetcode.com/submissions/detail/{index % 3}/', lambda index: None)
+
+        self.assertEqual(results.count(submissions.CREATED), 1)
+        self.assertEqual(results.count(submissions.UPDATED), self.threads - 1)
+        submission = Submission.objects.get(user=self.applicant, question=self.question)
+        self.assertEqual(submission.verification_status, Submission.VerificationStatus.PENDING)
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.progress_version, self.threads)
+
+    def test_repeats_of_a_keyed_request_are_saved_once(self):
+        link = 'https://leetcode.com/submissions/detail/1/'
+        results = self.hammer(lambda index: link, lambda index: 'double-click')
+
+        self.assertEqual(results.count(submissions.CREATED), 1)
+        self.assertEqual(results.count(submissions.REPLAYED), self.threads - 1)
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.progress_version, 1)
+
+    def test_only_operational_errors_are_retried(self):
+        link = 'https://leetcode.com/submissions/detail/1/'
+        with mock.patch.object(submissions, '_write', side_effect=IntegrityError) as write, \
+                self.assertRaises(IntegrityError):
+            record_submission(self.applicant, self.question, link)
+        self.assertEqual(write.call_count, 1)
+
+        with mock.patch.object(submissions, '_write', side_effect=[OperationalError, submissions.CREATED]) as write:
+            self.assertEqual(record_submission(self.applicant, self.question, link), submissions.CREATED)
+        self.assertEqual(write.call_count, 2)
+
+    def test_resubmission_keeps_the_original_submission_time(self):
+        record_submission(self.applicant, self.question, 'https://leetcode.com/submissions/detail/1/')
+        first = Submission.objects.get(user=self.applicant, question=self.question)
+        record_submission(self.applicant, self.question, 'https://leetcode.com/submissions/detail/2/')
+        second = Submission.objects.get(user=self.applicant, question=self.question)
+
+        self.assertEqual(second.submitted_at, first.submitted_at)
+        self.assertEqual(second.submission_link, 'https://leetcode.com/submissions/detail/2/')
@@ -0,0 +1,184 @@
+"""
+Offline verification of submission links.
+
+Links are fetched over keep-alive HTTP(S) connections shared between worker
+threads, with a cap on concurrent requests per host. Links are supplied by
+applicants, so only HTTPS URLs on LeetCode hosts are ever requested, and
+every redirect hop is checked again. Nothing here touches
+the database; the verify_submissions command owns reading and writing rows
+so that all ORM access stays on the main thread. This module must never be
+imported from a view.
+"""
+import http.client
+import threading
+from urllib.parse import urljoin, urlsplit
+
+from .models import Submission
+
+
+USER_AGENT = 'A2SVTracker-LinkVerifier/1.0'
+MAX_REDIRECTS = 5
+# Only the start of the page is needed to look for the problem slug.
+MAX_BODY_BYTES = 256 * 1024
+
+# The only URLs the verifier will request; anything else is never fetched.
+ALLOWED_SCHEMES = ('https',)
+ALLOWED_HOSTS = ('leetcode.com',)
+# None is the scheme's default port
+ALLOWED_PORTS = (None, 443)
+
+# Errors raised when a kept-alive connection was closed by the server between requests.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class DisallowedURL(ValueError):
+    """The URL is outside ALLOWED_SCHEMES, ALLOWED_HOSTS or ALLOWED_PORTS."""
+
+
+def is_allowed_url(url):
+    """True if ``url`` may be requested: an allowed scheme, port and host or subdomain."""
+    parts = urlsplit(url)
+    try:
+        port = parts.port
+    except ValueError:
+        return False
+    host = (parts.hostname or '').lower()
+    return (
+        parts.scheme in ALLOWED_SCHEMES
+        and port in ALLOWED_PORTS
+        and any(host == allowed or host.endswith('.' + allowed) for allowed in ALLOWED_HOSTS)
+    )
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive connections, bounded per (scheme, host)."""
+
+    def __init__(self, per_host=4, timeout=10):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+
+    def _slot(self, key):
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[key]
+
+    def _checkout(self, key):
+        """Return ``(connection, reused)`` for a host, preferring an idle one."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, netloc = key
+        connection_class = (
+            http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        )
+        return connection_class(netloc, timeout=self.timeout), False
+
+    def _checkin(self, key, connection):
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def get(self, url):
+        """
+        GET ``url`` and return ``(status, location, body)`` where ``body`` is
+        at most MAX_BODY_BYTES. Blocks while the host is at its concurrency cap.
+        Raises DisallowedURL for a URL that is_allowed_url rejects.
+        """
+        if not is_allowed_url(url):
+            raise DisallowedURL(url)
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = parts.path or '/'
+        if parts.query:
+            target = f'{target}?{parts.query}'
+
+        with self._slot(key):
+            return self._get(key, target)
+
+    def _get(self, key, target):
+        while True:
+            connection, reused = self._checkout(key)
+            try:
+                connection.request('GET', target, headers={'User-Agent': USER_AGENT})
+                response = connection.getresponse()
+                body = response.read(MAX_BODY_BYTES)
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused:
+                    # The server dropped an idle connection; retry on a fresh one.
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            # A partially read body leaves the socket unusable for the next request.
+            if response.isclosed() and not response.will_close:
+                self._checkin(key, connection)
+            else:
+                connection.close()
+            return response.status, response.getheader('Location'), body
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+def problem_slug(url):
+    """Return the LeetCode problem slug in ``url`` (``/problems/<slug>/...``), if any."""
+    segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+    if 'problems' in segments:
+        index = segments.index('problems')
+        if index + 1 < len(segments):
+            return segments[index + 1].lower()
+    return None
+
+
+def verify_link(pool, submission_link, problem_link):
+    """
+    Fetch a submission link and classify it as a Submission.VerificationStatus.
+    Links, or redirects, that leave the allowed hosts are not requested and
+    count as unsupported.
+    """
+    Status = Submission.VerificationStatus
+    expected_slug = problem_slug(problem_link)
+    url = submission_link
+
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            linked_slug = problem_slug(url)
+            if expected_slug and linked_slug and linked_slug != expected_slug:
+                return Status.MISMATCH
+
+            status, location, body = pool.get(url)
+
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if status >= 400:
+                return Status.UNREACHABLE
+            if expected_slug and (
+                linked_slug == expected_slug
+                or expected_slug.encode('utf-8') in body.lower()
+            ):
+                return Status.VERIFIED
+            return Status.REACHABLE
+    except DisallowedURL:
+        return Status.UNSUPPORTED
+    except (OSError, http.client.HTTPException, ValueError):
+        return Status.UNREACHABLE
+
+    # Too many redirects
+    return Status.UNREACHABLE
@@ -1,17 +1,98 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import Count
-from django.http import JsonResponse, HttpResponse
-from django.views.decorators.http import require_http_methods
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import Count, Max, Subquery, Sum
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_http_methods
 from django.contrib.auth import get_user_model
 import csv
+import hashlib
+import logging
 
-from .models import InvitationToken, User, Question, Submission
+from . import archive
+from . import warmup
+from .catalog import get_catalog, get_cohort_stats, invalidate_catalog
+from .models import ApplicationSnapshot, Cohort, InvitationToken, User, Question, Submission, cohort_thresholds
 from .forms import InviteRegisterForm, LoginForm, QuestionForm, SubmissionForm
+from .submissions import ApplicationFinalized, CohortClosed, record_submission
+
+
+logger = logging.getLogger(__name__)
+
+
+# Conditional GET
+#
+# Page ETags are built from version stamps maintained on write (see
+# Cohort.questions_version and User.progress_version), so an unchanged page
+# is answered with 304 before any template rendering.
+
+def _etag(request, *parts):
+    """Hash the given stamps with the viewer's identity into an ETag, or None to skip."""
+    # A pending flash message is only shown by a full render
+    if len(messages.get_messages(request)):
+        return None
+    csrf_secret = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    raw = '|'.join(str(part) for part in (request.user.pk, request.user.role, csrf_secret, *parts))
+    return hashlib.md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def _applicant_dashboard_etag(request):
+    user = request.user
+    cohort = user.cohort
+    if cohort is None:
+        return _etag(request, user.progress_version, user.is_finalized)
+    return _etag(
+        request, user.progress_version, user.is_finalized,
+        cohort.pk, cohort.questions_version, cohort.mandatory_required, cohort.total_questions,
+    )
+
+
+def _question_management_etag(request):
+    cohort = Cohort.get_active()
+    return _etag(request, cohort.pk, cohort.questions_version) if cohort else None
+
+
+def _applicant_tracker_etag(request):
+    cohort = Cohort.get_active()
+    if cohort is None:
+        return None
+    # Registrations change the count/max id; submissions and finalization bump progress_version
+    stamp = User.objects.filter(
+        cohort=cohort, role=User.Roles.APPLICANT
+    ).aggregate(count=Count('pk'), last=Max('pk'), progress=Sum('progress_version'))
+    return _etag(
+        request, cohort.pk, cohort.mandatory_required, cohort.total_questions,
+        stamp['count'], stamp['last'], stamp['progress'],
+    )
+
+
+# Health
+
+def health_check(request):
+    """Report database reachability and, when pooling is on, connection pool stats."""
+    if settings.WARMUP_ON_BOOT and not warmup.is_ready():
+        # Keep the instance out of rotation until caches and templates are primed
+        return JsonResponse({'status': 'warming_up'}, status=503)
+    
+    connection = connections['default']
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        # The endpoint is public; connection details only go to the log
+        logger.exception('Health check could not reach the database')
+        return JsonResponse({'status': 'error', 'database': 'unavailable'}, status=503)
+    
+    payload = {'status': 'ok', 'database': 'ok'}
+    pool = getattr(connection, 'pool', None)
+    if pool is not None:
+        payload['pool'] = pool.get_stats()
+    return JsonResponse(payload)
 
 
 # Authentication Views
@@ -41,12 +122,18 @@ def register_view(request):
                         messages.error(request, 'Email does not match the invitation.')
                         return render(request, 'auth/register.html', {'form': form})
                     
+                    # Usernames are emails, so an applicant of an earlier cohort cannot register again
+                    if User.objects.filter(username=invitation.email).exists():
+                        messages.error(request, 'An account with this email already exists. Please log in instead.')
+                        return render(request, 'auth/register.html', {'form': form})
+                    
                     user = User.objects.create_user(
                         username=invitation.email,
                         email=invitation.email,
                         password=form.cleaned_data['password'],
                         first_name=form.cleaned_data['name'],
-                        role=User.Roles.APPLICANT
+                        role=User.Roles.APPLICANT,
+                        cohort=invitation.cohort,
                     )
                     
                     invitation.used = True
@@ -59,6 +146,10 @@ def register_view(request):
             except InvitationToken.DoesNotExist:
                 messages.error(request, 'Invalid invitation token.')
                 return render(request, 'auth/register.html', {'form': form})
+            except IntegrityError:
+                # Another registration for the same email won the race
+                messages.error(request, 'An account with this email already exists. Please log in instead.')
+                return render(request, 'auth/register.html', {'form': form})
     else:
         # Pre-fill token from URL parameter if provided
         token = request.GET.get('token', '')
@@ -108,44 +199,45 @@ def logout_view(request):
 # Applicant Views
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_applicant_dashboard_etag)
 def applicant_dashboard(request):
     """Dashboard for applicants showing questions and progress."""
     if request.user.role != User.Roles.APPLICANT:
         return redirect('admin_dashboard')
     
-    # Get all active questions
-    mandatory_questions = Question.objects.filter(
-        is_active=True,
-        q_type=Question.QuestionType.MANDATORY
-    ).order_by('difficulty')
+    cohort = request.user.cohort
+    mandatory_required, total_questions = cohort_thresholds(cohort)
     
-    recommended_questions = Question.objects.filter(
-        is_active=True,
-        q_type=Question.QuestionType.RECOMMENDED
-    ).order_by('difficulty')
+    # Get all active questions of the applicant's cohort
+    catalog = get_catalog(cohort)
+    mandatory_questions = catalog['mandatory']
+    recommended_questions = catalog['recommended']
     
     # Get user's submissions
     user_submissions = {
         sub.question.pk: sub
-        for sub in Submission.objects.filter(user=request.user).select_related('question')
+        for sub in Submission.objects.filter(cohort=cohort, user=request.user).select_related('question')
     }
     
-    # Calculate progress
-    mandatory_count = Submission.objects.filter(
-        user=request.user,
-        question__q_type=Question.QuestionType.MANDATORY
-    ).count()
-    
-    total_count = Submission.objects.filter(user=request.user).count()
+    # Calculate progress from the submissions already loaded
+    mandatory_count = sum(
+        1 for sub in user_submissions.values()
+        if sub.question.q_type == Question.QuestionType.MANDATORY
+    )
+    total_count = len(user_submissions)
     
     context = {
+        'cohort': cohort,
         'mandatory_questions': mandatory_questions,
         'recommended_questions': recommended_questions,
         'user_submissions': user_submissions,
         'mandatory_count': mandatory_count,
         'total_count': total_count,
-        'remaining_mandatory': max(0, 15 - mandatory_count),
-        'can_finalize': mandatory_count >= 15,
+        'mandatory_required': mandatory_required,
+        'total_questions': total_questions,
+        'remaining_mandatory': max(0, mandatory_required - mandatory_count),
+        'can_finalize': mandatory_count >= mandatory_required,
         'is_finalized': request.user.is_finalized,
         'submission_form': SubmissionForm(),
     }
@@ -160,7 +252,9 @@ def submit_question(request, question_id):
     if request.user.role != User.Roles.APPLICANT:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    question = get_object_or_404(Question, id=question_id, is_active=True)
+    question = get_object_or_404(
+        Question, id=question_id, cohort=request.user.cohort, is_active=True
+    )
     form = SubmissionForm(request.POST)
 
     if not form.is_valid():
@@ -168,16 +262,18 @@ def submit_question(request, question_id):
         return redirect('applicant_dashboard')
 
     submission_link = form.cleaned_data['submission_link']
+    idempotency_key = request.headers.get('Idempotency-Key') or request.POST.get('idempotency_key')
 
-    # Create or update submission with validated data
-    submission, created = Submission.objects.update_or_create(
-        user=request.user,
-        question=question,
-        defaults={'submission_link': submission_link}
-    )
-    
-    action = 'submitted' if created else 'updated'
-    messages.success(request, f'Solution {action} successfully!')
+    try:
+        result = record_submission(request.user, question, submission_link, idempotency_key)
+    except ApplicationFinalized:
+        messages.error(request, 'Your application is finalized; submissions can no longer be changed.')
+        return redirect('applicant_dashboard')
+    except CohortClosed:
+        messages.error(request, 'This application cycle is closed.')
+        return redirect('applicant_dashboard')
+
+    messages.success(request, f'Solution {result} successfully!')
     return redirect('applicant_dashboard')
 
 
@@ -188,17 +284,57 @@ def finalize_application(request):
     if request.user.role != User.Roles.APPLICANT:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    mandatory_count = Submission.objects.filter(
-        user=request.user,
-        question__q_type=Question.QuestionType.MANDATORY
-    ).count()
-    
-    if mandatory_count < 15:
-        messages.error(request, f'You need to submit {15 - mandatory_count} more mandatory questions.')
-        return redirect('applicant_dashboard')
-    
-    request.user.is_finalized = True
-    request.user.save(update_fields=['is_finalized'])
+    cohort = request.user.cohort
+    mandatory_required, _ = cohort_thresholds(cohort)
+    
+    with transaction.atomic():
+        # Lock the applicant row; submit_question takes the same lock before writing
+        user = User.objects.select_for_update().get(pk=request.user.pk)
+        if user.is_finalized:
+            messages.info(request, 'Your application is already finalized.')
+            return redirect('applicant_dashboard')
+        if Cohort.objects.filter(pk=user.cohort_id, archived_at__isnull=False).exists():
+            messages.error(request, 'This application cycle is closed.')
+            return redirect('applicant_dashboard')
+        
+        submissions = [
+            {
+                'question_id': sub.question.pk,
+                'title': sub.question.title,
+                'q_type': sub.question.q_type,
+                'difficulty': sub.question.difficulty,
+                'submission_link': sub.submission_link,
+                'submitted_at': sub.submitted_at.isoformat(),
+            }
+            for sub in Submission.objects.filter(
+                cohort=cohort, user=user
+            ).select_related('question').order_by('question__q_type', 'question__difficulty')
+        ]
+        mandatory_count = sum(
+            1 for sub in submissions if sub['q_type'] == Question.QuestionType.MANDATORY
+        )
+        
+        if mandatory_count < mandatory_required:
+            messages.error(
+                request,
+                f'You need to submit {mandatory_required - mandatory_count} more mandatory questions.'
+            )
+            return redirect('applicant_dashboard')
+        
+        # An admin may have cleared is_finalized since an earlier finalize; take a fresh snapshot.
+        ApplicationSnapshot.objects.update_or_create(
+            user=user,
+            defaults={
+                'cohort': cohort,
+                'finalized_at': timezone.now(),
+                'mandatory_count': mandatory_count,
+                'total_count': len(submissions),
+                'submissions': submissions,
+            },
+        )
+        user.is_finalized = True
+        user.progress_version += 1
+        user.save(update_fields=['is_finalized', 'progress_version'])
     
     messages.success(request, 'Application finalized successfully!')
     return redirect('applicant_dashboard')
@@ -212,34 +348,32 @@ def admin_dashboard(request):
     if request.user.role != User.Roles.ADMIN and not request.user.is_staff:
         return redirect('applicant_dashboard')
     
-    # Get statistics
-    total_applicants = User.objects.filter(role=User.Roles.APPLICANT).count()
-    finalized_applicants = User.objects.filter(
-        role=User.Roles.APPLICANT,
-        is_finalized=True
-    ).count()
-    total_questions = Question.objects.filter(is_active=True).count()
-    total_submissions = Submission.objects.count()
+    cohort = Cohort.get_active()
     
+    # Get statistics for the active cohort
     context = {
-        'total_applicants': total_applicants,
-        'finalized_applicants': finalized_applicants,
-        'total_questions': total_questions,
-        'total_submissions': total_submissions,
+        'cohort': cohort,
+        **get_cohort_stats(cohort),
     }
     
     return render(request, 'admin/dashboard.html', context)
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_question_management_etag)
 def question_management(request):
     """Manage questions (CRUD operations)."""
     if request.user.role != User.Roles.ADMIN:
         return redirect('applicant_dashboard')
     
-    questions = Question.objects.filter(is_active=True).order_by('q_type', 'difficulty')
+    cohort = Cohort.get_active()
+    questions = Question.objects.filter(
+        cohort=cohort, is_active=True
+    ).order_by('q_type', 'difficulty')
     
     context = {
+        'cohort': cohort,
         'questions': questions,
     }
     
@@ -255,7 +389,10 @@ def question_create(request):
     if request.method == 'POST':
         form = QuestionForm(request.POST)
         if form.is_valid():
-            form.save()
+            question = form.save(commit=False)
+            question.cohort = Cohort.get_active()
+            question.save()
+            invalidate_catalog(question.cohort)
             messages.success(request, 'Question created successfully!')
             return redirect('question_management')
     else:
@@ -273,12 +410,13 @@ def question_edit(request, question_id):
     if request.user.role != User.Roles.ADMIN:
         return redirect('applicant_dashboard')
     
-    question = get_object_or_404(Question, id=question_id)
+    question = get_object_or_404(Question, id=question_id, cohort=Cohort.get_active())
     
     if request.method == 'POST':
         form = QuestionForm(request.POST, instance=question)
         if form.is_valid():
             form.save()
+            invalidate_catalog(question.cohort)
             messages.success(request, 'Question updated successfully!')
             return redirect('question_management')
     else:
@@ -298,58 +436,186 @@ def question_delete(request, question_id):
     if request.user.role != User.Roles.ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    question = get_object_or_404(Question, id=question_id)
+    question = get_object_or_404(Question, id=question_id, cohort=Cohort.get_active())
     question.is_active = False
     question.save(update_fields=['is_active'])
+    invalidate_catalog(question.cohort)
     
     messages.success(request, 'Question deactivated successfully!')
     return redirect('question_management')
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_applicant_tracker_etag)
 def applicant_tracker(request):
     """View and track all applicants."""
     if request.user.role != User.Roles.ADMIN:
         return redirect('applicant_dashboard')
     
+    cohort = Cohort.get_active()
+    mandatory_required, total_questions = cohort_thresholds(cohort)
+    
     applicants = User.objects.filter(
+        cohort=cohort,
         role=User.Roles.APPLICANT
     ).annotate(
         total_submissions=Count('submissions')
     ).order_by('-total_submissions')
     
     context = {
+        'cohort': cohort,
         'applicants': applicants,
+        'mandatory_required': mandatory_required,
+        'total_questions': total_questions,
+        'strong_threshold': total_questions * 3 // 4,
     }
     
     return render(request, 'admin/applicants.html', context)
 
 
 @login_required
-def export_applicants(request):
-    """Export applicants data as CSV."""
+def link_collisions(request):
+    """Report solution links shared by more than one applicant in the active cohort."""
     if request.user.role != User.Roles.ADMIN:
         return redirect('applicant_dashboard')
     
-    applicants = User.objects.filter(
-        role=User.Roles.APPLICANT
+    cohort = Cohort.get_active()
+    
+    # Hashes submitted by two or more distinct applicants, grouped in the database
+    shared_hashes = Submission.objects.filter(
+        cohort=cohort
+    ).exclude(
+        link_hash=''
+    ).values(
+        'link_hash'
     ).annotate(
-        total_submissions=Count('submissions')
-    ).order_by('-total_submissions')
+        applicant_count=Count('user', distinct=True)
+    ).filter(
+        applicant_count__gt=1
+    ).values('link_hash')
     
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="applicants.csv"'
+    submissions = Submission.objects.filter(
+        cohort=cohort,
+        link_hash__in=Subquery(shared_hashes)
+    ).select_related('user', 'question').order_by('link_hash', 'submitted_at')
     
-    writer = csv.writer(response)
-    writer.writerow(['Rank', 'Name', 'Email', 'Total Submissions', 'Finalized'])
+    collisions = {}
+    for submission in submissions:
+        collisions.setdefault(submission.link_hash, []).append(submission)
     
-    for rank, applicant in enumerate(applicants, start=1):
-        writer.writerow([
-            rank,
-            applicant.get_full_name() or applicant.first_name or applicant.username,
-            applicant.email,
-            getattr(applicant, 'total_submissions', 0),
-            'Yes' if applicant.is_finalized else 'No'
+    context = {
+        'cohort': cohort,
+        'collisions': list(collisions.values()),
+    }
+    
+    return render(request, 'admin/collisions.html', context)
+
+
+@login_required
+def application_review(request, user_id):
+    """Review a finalized application from its frozen snapshot."""
+    if request.user.role != User.Roles.ADMIN:
+        return redirect('applicant_dashboard')
+    
+    snapshot = get_object_or_404(
+        ApplicationSnapshot.objects.select_related('user', 'cohort'),
+        user_id=user_id
+    )
+    
+    return render(request, 'admin/review.html', {'snapshot': snapshot})
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+    def write(self, value):
+        return value
+
+
+@login_required
+def export_reviews(request):
+    """Stream every finalized application of the active cohort as CSV, one row per submission."""
+    if request.user.role != User.Roles.ADMIN:
+        return redirect('applicant_dashboard')
+    
+    snapshots = ApplicationSnapshot.objects.filter(
+        cohort=Cohort.get_active()
+    ).select_related('user').order_by('finalized_at')
+    
+    def rows():
+        writer = csv.writer(Echo())
+        yield writer.writerow([
+            'Name', 'Email', 'Finalized At', 'Mandatory', 'Total',
+            'Question', 'Type', 'Difficulty', 'Submission Link', 'Submitted At'
         ])
+        for snapshot in snapshots.iterator(chunk_size=500):
+            applicant = snapshot.user
+            name = applicant.get_full_name() or applicant.first_name or applicant.username
+            for sub in snapshot.submissions:
+                yield writer.writerow([
+                    name,
+                    applicant.email,
+                    snapshot.finalized_at.isoformat(),
+                    snapshot.mandatory_count,
+                    snapshot.total_count,
+                    sub['title'],
+                    sub['q_type'],
+                    sub['difficulty'],
+                    sub['submission_link'],
+                    sub['submitted_at'],
+                ])
+    
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="reviews.csv"'
+    return response
+
+
+@login_required
+def export_applicants(request):
+    """Export applicants data as CSV, reading archived cohorts from cold storage."""
+    if request.user.role != User.Roles.ADMIN:
+        return redirect('applicant_dashboard')
     
+    cohort_id = request.GET.get('cohort')
+    if cohort_id:
+        if not cohort_id.isdigit():
+            raise Http404('Unknown cohort.')
+        cohort = get_object_or_404(Cohort, pk=cohort_id)
+    else:
+        cohort = Cohort.get_active()
+    
+    # Until the archive file exists, an archiving cohort's rows are still in the database
+    if cohort is not None and cohort.archived_at and settings.ARCHIVE_ROOT and archive.archive_path(cohort).exists():
+        rows = archive.applicant_rows(archive.archive_path(cohort))
+    else:
+        applicants = User.objects.filter(
+            cohort=cohort,
+            role=User.Roles.APPLICANT
+        ).annotate(
+            total_submissions=Count('submissions')
+        ).order_by('-total_submissions')
+        rows = (
+            (
+                applicant.get_full_name() or applicant.first_name or applicant.username,
+                applicant.email,
+                getattr(applicant, 'total_submissions', 0),
+                applicant.is_finalized,
+            )
+            for applicant in applicants.iterator(chunk_size=500)
+        )
+    
+    def csv_rows():
+        writer = csv.writer(Echo())
+        yield writer.writerow(['Rank', 'Name', 'Email', 'Total Submissions', 'Finalized'])
+        for rank, (name, email, total_submissions, is_finalized) in enumerate(rows, start=1):
+            yield writer.writerow([
+                rank,
+                name,
+                email,
+                total_submissions,
+                'Yes' if is_finalized else 'No'
+            ])
+    
+    response = StreamingHttpResponse(csv_rows(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="applicants.csv"'
     return response
@@ -0,0 +1,80 @@
+"""
+Priming of per-process caches before an instance takes traffic.
+
+``warm_up`` loads the active cohort's question catalog and statistics,
+compiles the page templates, builds the URL resolver and checks the
+database connection. Templates are compiled but not rendered: most pages
+need a logged-in request and view context, and compiling is what fills the
+template cache. With gunicorn ``--preload`` it runs once in the master and
+the workers inherit the warm caches; the health check reports 503 until
+it has finished.
+"""
+import logging
+import threading
+
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import reverse
+
+from .catalog import get_catalog, get_cohort_stats
+from .models import Cohort
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES = [
+    'base.html',
+    'auth/login.html',
+    'auth/register.html',
+    'applicant/dashboard.html',
+    'admin/dashboard.html',
+    'admin/questions.html',
+    'admin/question_form.html',
+    'admin/applicants.html',
+    'admin/collisions.html',
+    'admin/review.html',
+]
+
+_ready = threading.Event()
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def warm_up():
+    """Prime caches and templates, mark this process ready and return the number of templates compiled."""
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+    cohort = Cohort.get_active()
+    get_catalog(cohort)
+    get_cohort_stats(cohort)
+
+    compiled = 0
+    for name in TEMPLATES:
+        try:
+            get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            # The page itself will fail loudly; not worth failing the boot over.
+            logger.warning('Warm-up compile of %s failed', name, exc_info=True)
+        else:
+            compiled += 1
+    # The first reverse() builds the URL resolver for the whole project
+    reverse('login')
+
+    release_connections()
+    _ready.set()
+    return compiled
+
+
+def release_connections():
+    """
+    Close database connections (and pools) so that none are shared with
+    processes forked after warm-up. Workers open their own on demand.
+    """
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        close_pool = getattr(connection, 'close_pool', None)
+        if close_pool is not None:
+            close_pool()